@@ -0,0 +1,305 @@
+"""
+Phase 2 Feature Store
+Versioned, memory-mappable feature columns for model training
+
+Model features are computed once from the cleaned dataset with vectorized
+groupby/transform and written as one .npy file per column under
+<root>/<version>/, next to a manifest.json describing columns, encodings and
+the source data. Columns are opened with mmap_mode='r', so assembling a
+training set only touches the columns and rows it needs.
+
+Rows are sorted by entity (video_id, country) and trending date. Channel
+history features only use rows from strictly earlier trending dates, and
+as_of() lookups return the latest row at or before the requested date, so
+training sets built from the store are point-in-time correct. When the
+cleaned dataset carries first-trending snapshots (first_trending_date and
+first_views etc.), the store also holds those and a channel history as of
+the first trending date, built only from rows last seen trending before it.
+
+Usage (after phase2_preprocessing.py):
+    python feature_store.py
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FEATURE_STORE_DIR = os.getenv('FEATURE_STORE_DIR', 'feature_store')
+
+# Column name -> description, in manifest order
+FEATURES = {
+    'trending_day': 'Trending date as days since 1970-01-01 (event time)',
+    'country_code': 'Country encoding (see manifest encodings)',
+    'category_code': 'Category encoding (see manifest encodings)',
+    'channel_code': 'Channel encoding (see manifest encodings)',
+    'views': 'Views at the trending snapshot',
+    'likes': 'Likes at the trending snapshot',
+    'dislikes': 'Dislikes at the trending snapshot',
+    'comment_count': 'Comments at the trending snapshot',
+    'engagement_ratio': '(likes + comment_count) / views',
+    'like_dislike_ratio': 'likes / dislikes',
+    'tags_count': 'Number of tags',
+    'days_to_trend': 'Days from publish to trending',
+    'publish_hour': 'Publish hour (0-23)',
+    'publish_day_of_week': 'Publish weekday (0 = Monday)',
+    'publish_month': 'Publish month (1-12)',
+    'channel_prior_videos': 'Channel trending rows on earlier dates (all countries)',
+    'channel_prior_mean_log_views': 'Mean log1p(views) of those earlier rows (NaN if none)',
+    'channel_prior_max_log_views': 'Max log1p(views) of those earlier rows (NaN if none)',
+    'channel_days_since_first_trend': 'Days since the channel first trended',
+    'first_trending_day': 'First trending date in the country as days since 1970-01-01',
+    'first_views': 'Views at the first trending snapshot',
+    'first_likes': 'Likes at the first trending snapshot',
+    'first_dislikes': 'Dislikes at the first trending snapshot',
+    'first_comment_count': 'Comments at the first trending snapshot',
+    'days_to_first_trend': 'Days from publish to first trending',
+    'first_trend_channel_prior_videos': 'Channel rows last seen trending before this row first trended',
+    'first_trend_channel_prior_mean_log_views': 'Mean log1p(views) of those rows (NaN if none)',
+    'first_trend_channel_prior_max_log_views': 'Max log1p(views) of those rows (NaN if none)',
+}
+
+# Columns written only when the cleaned dataset has first-trending snapshots
+FIRST_TREND_COLUMNS = ['first_views', 'first_likes', 'first_dislikes', 'first_comment_count']
+
+
+def _encode(values):
+    """Sorted-vocabulary integer codes (-1 for missing) and the vocabulary"""
+    codes, vocabulary = pd.factorize(values, sort=True)
+    return codes, [str(v) for v in vocabulary]
+
+
+def channel_history(channels, days, log_views, as_of=None):
+    """
+    Point-in-time channel aggregates per row: count, mean and max log views of
+    the channel's rows on days strictly before as_of (default: the row's own
+    day), and days since the channel's first day up to as_of.
+    """
+    as_of = days if as_of is None else as_of
+    daily = pd.DataFrame({'channel': channels, 'day': days, 'log_views': log_views}) \
+        .groupby(['channel', 'day'], sort=True)['log_views'].agg(['size', 'sum', 'max'])
+    by_channel = daily.groupby(level='channel', sort=False)
+    cumulative_videos = by_channel['size'].cumsum().to_numpy()
+    cumulative_sum = by_channel['sum'].cumsum().to_numpy()
+    cumulative_max = by_channel['max'].cummax().to_numpy()
+    daily_channel = daily.index.get_level_values('channel').to_numpy(dtype=np.int64)
+    daily_keys = (daily_channel << 32) + daily.index.get_level_values('day').to_numpy(dtype=np.int64)
+
+    # Last daily entry of the same channel strictly before as_of
+    channels = np.asarray(channels, dtype=np.int64)
+    entry = np.searchsorted(daily_keys, (channels << 32) + np.asarray(as_of, dtype=np.int64), side='left') - 1
+    found = entry >= 0
+    found[found] &= daily_channel[entry[found]] == channels[found]
+    entry = np.where(found, entry, 0)
+    prior_videos = np.where(found, cumulative_videos[entry], 0)
+    first_day = pd.Series(np.minimum(days, as_of)).groupby(channels).transform('min').to_numpy()
+    return {
+        'channel_prior_videos': prior_videos,
+        'channel_prior_mean_log_views': np.where(found, cumulative_sum[entry], np.nan)
+                                        / np.where(prior_videos > 0, prior_videos, np.nan),
+        'channel_prior_max_log_views': np.where(found, cumulative_max[entry], np.nan),
+        'channel_days_since_first_trend': np.asarray(as_of) - first_day,
+    }
+
+
+def compute_features(df):
+    """
+    Feature columns for every row of the cleaned dataset, sorted by
+    (video_id, country, trending date).
+
+    Returns (columns, keys, encodings): columns maps feature name -> array,
+    keys holds video_id and country arrays, encodings the vocabularies.
+    """
+    trending = pd.to_datetime(df['trending_date']).dt.normalize()
+    publish = pd.to_datetime(df['publish_time'])
+    order = np.lexsort((trending.to_numpy(), df['country'].to_numpy(), df['video_id'].to_numpy()))
+    df = df.iloc[order].reset_index(drop=True)
+    trending = trending.iloc[order].reset_index(drop=True)
+    publish = publish.iloc[order].reset_index(drop=True)
+
+    days = (trending.to_numpy().astype('datetime64[D]').astype(np.int64)).astype(np.int32)
+    country_codes, countries = _encode(df['country'])
+    category_codes, categories = _encode(df['category_name'])
+    channel_codes, channels = _encode(df['channel_title'])
+    log_views = np.log1p(df['views'].to_numpy(dtype=np.float64))
+
+    columns = {
+        'trending_day': days,
+        'country_code': country_codes.astype(np.int8),
+        'category_code': category_codes.astype(np.int16),
+        'channel_code': channel_codes.astype(np.int32),
+        'publish_hour': publish.dt.hour.to_numpy(dtype=np.int8),
+        'publish_day_of_week': publish.dt.dayofweek.to_numpy(dtype=np.int8),
+        'publish_month': publish.dt.month.to_numpy(dtype=np.int8),
+    }
+    for column in ['views', 'likes', 'dislikes', 'comment_count', 'engagement_ratio',
+                   'like_dislike_ratio', 'tags_count', 'days_to_trend']:
+        columns[column] = df[column].to_numpy(dtype=np.float64)
+    history = channel_history(channel_codes, days, log_views)
+    columns['channel_prior_videos'] = history['channel_prior_videos'].astype(np.int32)
+    for column in ['channel_prior_mean_log_views', 'channel_prior_max_log_views']:
+        columns[column] = history[column].astype(np.float64)
+    columns['channel_days_since_first_trend'] = history['channel_days_since_first_trend'].astype(np.int32)
+
+    # Snapshot of the first trending date, and what was known about the channel then: a row's
+    # peak views are only known once it was last seen trending, so history is keyed on that day
+    if 'first_trending_date' in df.columns and all(column in df.columns for column in FIRST_TREND_COLUMNS):
+        first_trending = pd.to_datetime(df['first_trending_date']).dt.normalize()
+        first_days = first_trending.to_numpy().astype('datetime64[D]').astype(np.int64).astype(np.int32)
+        columns['first_trending_day'] = first_days
+        for column in FIRST_TREND_COLUMNS:
+            columns[column] = df[column].to_numpy(dtype=np.float64)
+        columns['days_to_first_trend'] = (first_trending - publish.dt.normalize()).dt.days.clip(lower=0) \
+            .to_numpy(dtype=np.float64)
+        history = channel_history(channel_codes, days, log_views, as_of=first_days)
+        columns['first_trend_channel_prior_videos'] = history['channel_prior_videos'].astype(np.int32)
+        for column in ['channel_prior_mean_log_views', 'channel_prior_max_log_views']:
+            columns[f'first_trend_{column}'] = history[column].astype(np.float64)
+
+    keys = {'video_id': df['video_id'].astype(str).to_numpy(dtype=str),
+            'country': df['country'].astype(str).to_numpy(dtype=str)}
+    encodings = {'country': countries, 'category_name': categories, 'channel_title': channels}
+    return {name: columns[name] for name in FEATURES if name in columns}, keys, encodings
+
+
+def source_fingerprint(df):
+    """Stable hash of the row keys, dates and views the features were computed from"""
+    hashed = pd.util.hash_pandas_object(df[['video_id', 'country', 'trending_date', 'views']].astype(str),
+                                        index=False)
+    return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+
+
+def _next_version(root):
+    existing = [int(name[1:]) for name in os.listdir(root) if name[:1] == 'v' and name[1:].isdigit()] \
+        if os.path.isdir(root) else []
+    return f"v{max(existing, default=0) + 1}"
+
+
+class FeatureStore:
+    """Memory-mapped feature columns of one store version, with point-in-time lookups"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest['version']
+        self.encodings = self.manifest['encodings']
+        self._columns = {}
+        self.video_id = self._load('video_id')
+        self.country = self._load('country')
+        self.trending_day = self.column('trending_day')
+
+        # Entity = (video_id, country); rows are sorted by entity then day
+        starts = np.r_[True, (self.video_id[1:] != self.video_id[:-1]) | (self.country[1:] != self.country[:-1])]
+        self.entity = np.cumsum(starts) - 1
+        first = np.flatnonzero(starts)
+        self.entity_index = pd.MultiIndex.from_arrays([self.video_id[first], self.country[first]])
+        self._sort_keys = (self.entity.astype(np.int64) << 32) + self.trending_day.astype(np.int64)
+
+    @classmethod
+    def write(cls, columns, keys, encodings, root=FEATURE_STORE_DIR, version=None, source=None):
+        """Write a new version (v1, v2, ... unless given) and point LATEST at it; existing versions are never overwritten"""
+        os.makedirs(root, exist_ok=True)
+        version = version or _next_version(root)
+        directory = os.path.join(root, version)
+        if os.path.exists(directory):
+            raise FileExistsError(f"Feature store version {version} already exists in {root}")
+        # A staging directory left by an interrupted write holds partial columns
+        staging = directory + '.tmp'
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+        os.makedirs(staging)
+        for name, values in {**keys, **columns}.items():
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(values))
+        manifest = {
+            'version': version,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'rows': int(len(keys['video_id'])),
+            'keys': list(keys),
+            'columns': {name: {'dtype': str(np.asarray(values).dtype), 'description': FEATURES.get(name, '')}
+                        for name, values in columns.items()},
+            'encodings': encodings,
+            'source': source or {},
+        }
+        with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(staging, directory)
+        with open(os.path.join(root, 'LATEST'), 'w', encoding='utf-8') as f:
+            f.write(version)
+        return cls(directory)
+
+    @classmethod
+    def open(cls, root=FEATURE_STORE_DIR, version='latest'):
+        if version == 'latest':
+            with open(os.path.join(root, 'LATEST'), 'r', encoding='utf-8') as f:
+                version = f.read().strip()
+        return cls(os.path.join(root, version))
+
+    def __len__(self):
+        return len(self.video_id)
+
+    @property
+    def columns(self):
+        return list(self.manifest['columns'])
+
+    def _load(self, name):
+        return np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode='r')
+
+    def column(self, name):
+        """Memory-mapped array for one feature column"""
+        if name not in self._columns:
+            self._columns[name] = self._load(name)
+        return self._columns[name]
+
+    def frame(self, columns=None, rows=None):
+        """DataFrame of the selected columns (all by default) for the given row positions (all by default)"""
+        columns = columns or self.columns
+        select = slice(None) if rows is None else rows
+        return pd.DataFrame({name: self.column(name)[select] for name in columns})
+
+    def as_of(self, video_ids, countries, dates):
+        """
+        Row positions of the latest snapshot for each (video_id, country) at or
+        before each date, or -1 when the entity is unknown or has no row yet.
+        """
+        entity = self.entity_index.get_indexer(pd.MultiIndex.from_arrays([np.asarray(video_ids, dtype=str),
+                                                                          np.asarray(countries, dtype=str)]))
+        query_days = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]').astype(np.int64)
+        query_keys = (entity.astype(np.int64) << 32) + query_days
+        rows = np.searchsorted(self._sort_keys, query_keys, side='right') - 1
+        found = (entity >= 0) & (rows >= 0)
+        found[found] &= self.entity[rows[found]] == entity[found]
+        return np.where(found, rows, -1)
+
+    def training_set(self, requests, columns=None, date_col='as_of'):
+        """
+        Point-in-time features for a DataFrame of (video_id, country, as_of)
+        requests; unmatched requests get NaN features.
+        """
+        rows = self.as_of(requests['video_id'], requests['country'], requests[date_col])
+        features = self.frame(columns, np.maximum(rows, 0)).astype(np.float64)
+        features.loc[rows < 0] = np.nan
+        features.index = requests.index
+        return pd.concat([requests, features], axis=1)
+
+
+def build_feature_store(df, root=FEATURE_STORE_DIR, version=None):
+    """Compute features for the cleaned dataset and write them as a new store version"""
+    columns, keys, encodings = compute_features(df)
+    source = {'rows': int(len(df)), 'fingerprint': source_fingerprint(df)}
+    return FeatureStore.write(columns, keys, encodings, root, version, source)
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("PHASE 2: FEATURE STORE")
+    print("=" * 80)
+    start = datetime.now()
+    cleaned = pd.read_csv('youtube_trending_cleaned.csv')
+    store = build_feature_store(cleaned)
+    print(f"✓ Wrote {len(store.columns)} feature columns for {len(store):,} rows to {store.directory} "
+          f"in {(datetime.now() - start).total_seconds():.2f}s")
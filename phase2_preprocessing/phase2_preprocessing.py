@@ -8,6 +8,7 @@ import numpy as np
 import json
 import re
 from datetime import datetime
+from feature_store import build_feature_store
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -312,6 +313,12 @@ print(f"  Found {duplicates_before:,} duplicate video_id entries within countrie
 # Sort by trending_date (latest first) to keep most recent trending occurrence
 df = df.sort_values(['country', 'video_id', 'trending_date'], ascending=[True, True, False])
 
+# Earliest trending date per video and country survives deduplication as its own column,
+# together with the engagement of that first snapshot (known when the video starts trending)
+df['first_trending_date'] = df['trending_date']
+for col in ['views', 'likes', 'dislikes', 'comment_count']:
+    df[f'first_{col}'] = df[col]
+
 # For duplicates within same country, keep the latest (first after sorting)
 # Aggregate engagement metrics: use max values
 agg_dict = {
@@ -325,6 +332,11 @@ agg_dict = {
     'category_name': 'first',
     'publish_time': 'first',
     'trending_date': 'first',  # Keep the latest trending date
+    'first_trending_date': 'min',  # Date the video first trended in this country
+    'first_views': 'last',  # Engagement at that first snapshot (rows are sorted latest first)
+    'first_likes': 'last',
+    'first_dislikes': 'last',
+    'first_comment_count': 'last',
     'tags': 'first',
     'tags_list': 'first',
     'tags_cleaned': 'first',
@@ -432,9 +444,10 @@ print("-" * 80)
 
 # Select and reorder columns for final output
 final_columns = [
-    'video_id', 'trending_date', 'title', 'channel_title', 'category_id', 
+    'video_id', 'trending_date', 'first_trending_date', 'title', 'channel_title', 'category_id', 
     'category_name', 'publish_time', 'tags', 'tags_list', 'tags_count', 
-    'views', 'likes', 'dislikes', 'comment_count', 'thumbnail_link',
+    'views', 'likes', 'dislikes', 'comment_count',
+    'first_views', 'first_likes', 'first_dislikes', 'first_comment_count', 'thumbnail_link',
     'comments_disabled', 'ratings_disabled', 'video_error_or_removed', 
     'description', 'country',
     'publish_year', 'publish_month', 'publish_day', 'publish_day_of_week',
@@ -555,11 +568,25 @@ print(f"✓ Saved summary report to {report_file}")
 # Print summary
 print(summary_report)
 
+# ============================================================================
+# STEP 15: Build Feature Store
+# ============================================================================
+
+print("\n[15] Building Feature Store...")
+print("-" * 80)
+
+# Model features as versioned memory-mapped columns (see feature_store.py)
+feature_start = datetime.now()
+feature_store = build_feature_store(df_final)
+print(f"✓ Wrote {len(feature_store.columns)} feature columns for {len(feature_store):,} rows to "
+      f"{feature_store.directory} in {(datetime.now() - feature_start).total_seconds():.2f}s")
+
 print("\n" + "=" * 80)
 print("PHASE 2 COMPLETED SUCCESSFULLY!")
 print("=" * 80)
 print(f"\nOutput files:")
 print(f"  1. {output_file}")
 print(f"  2. {report_file}")
-print(f"  3. phase2_preprocessing.py (this script)")
+print(f"  3. {feature_store.directory}/ (feature store, version {feature_store.version})")
+print(f"  4. phase2_preprocessing.py (this script)")
 
@@ -0,0 +1,258 @@
+"""
+Views Forecaster
+Baseline ridge regression of peak log views on feature-store columns
+
+Predicts the log1p(views) a video reaches in a country from what is known
+on the day it first trends there: the engagement of that first snapshot,
+days from publish to first trending, publish timing, tags, the channel's
+history from rows last seen trending before that day, and one-hot
+country/category codes. Requires a feature store built from a cleaned
+dataset with first-trending snapshots (phase2_preprocessing.py).
+
+Training accumulates X'X and X'y over row chunks and solves the regularized
+normal equations once, so it streams over datasets of any length; scoring is
+one matrix-vector product per chunk.
+
+Usage (after feature_store.py):
+    python views_forecaster.py
+"""
+
+import os
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from feature_store import FeatureStore, FEATURE_STORE_DIR
+
+FORECAST_ALPHA = float(os.getenv('FORECAST_ALPHA', '1.0'))
+
+# Rows per chunk when building design matrices, training and scoring
+CHUNK_ROWS = int(os.getenv('FORECAST_CHUNK_ROWS', '262144'))
+
+# Feature-store columns fed through log1p, used as-is, or one-hot encoded; all are
+# known on the first trending day (the peak snapshot only supplies the target)
+LOG_COLUMNS = ['first_views', 'first_likes', 'first_dislikes', 'first_comment_count',
+               'first_trend_channel_prior_videos']
+NUMERIC_COLUMNS = ['tags_count', 'days_to_first_trend', 'publish_hour',
+                   'first_trend_channel_prior_mean_log_views', 'first_trend_channel_prior_max_log_views']
+ONE_HOT_COLUMNS = {'country_code': 'country', 'category_code': 'category_name',
+                   'publish_day_of_week': None}
+
+
+def feature_names(encodings):
+    names = [f"log1p_{column}" for column in LOG_COLUMNS] + list(NUMERIC_COLUMNS)
+    names += [f"{column}_missing" for column in NUMERIC_COLUMNS if 'channel_prior_' in column]
+    for column, vocabulary in ONE_HOT_COLUMNS.items():
+        levels = encodings[vocabulary] if vocabulary else range(7)
+        names += [f"{column}={level}" for level in levels]
+    return names
+
+
+def design_matrix(columns, encodings, rows=slice(None)):
+    """
+    Float64 design matrix for the selected rows of a column mapping (a
+    FeatureStore or a dict of arrays). Missing channel history becomes 0 plus
+    an indicator column; categorical codes are one-hot encoded.
+    """
+    get = columns.column if isinstance(columns, FeatureStore) else columns.__getitem__
+    blocks = [np.log1p(np.maximum(np.asarray(get(column)[rows], dtype=np.float64), 0)) for column in LOG_COLUMNS]
+    indicators = []
+    for column in NUMERIC_COLUMNS:
+        values = np.asarray(get(column)[rows], dtype=np.float64)
+        if 'channel_prior_' in column:
+            missing = np.isnan(values)
+            indicators.append(missing.astype(np.float64))
+            values = np.where(missing, 0, values)
+        blocks.append(values)
+    blocks += indicators
+
+    n = len(blocks[0])
+    dense = np.column_stack(blocks) if blocks else np.empty((n, 0))
+    one_hot = []
+    for column, vocabulary in ONE_HOT_COLUMNS.items():
+        width = len(encodings[vocabulary]) if vocabulary else 7
+        codes = np.asarray(get(column)[rows], dtype=np.int64)
+        encoded = np.zeros((n, width))
+        valid = (codes >= 0) & (codes < width)
+        encoded[np.flatnonzero(valid), codes[valid]] = 1.0
+        one_hot.append(encoded)
+    return np.hstack([dense] + one_hot)
+
+
+def _chunks(n, chunk_rows=CHUNK_ROWS):
+    for start in range(0, n, chunk_rows):
+        yield slice(start, min(start + chunk_rows, n))
+
+
+class RidgeForecaster:
+    """Ridge regression on standardized features with an unpenalized intercept"""
+
+    def __init__(self, alpha=FORECAST_ALPHA, names=None):
+        self.alpha = alpha
+        self.names = names
+        self.mean = None
+        self.scale = None
+        self.coef = None
+        self.intercept = 0.0
+
+    def fit_batches(self, batches):
+        """
+        Fit from an iterable of (X, y) batches: one pass accumulating sums
+        and cross-products, then a single solve.
+        """
+        n, sum_x, sum_y, xtx, xty = 0, None, 0.0, None, None
+        for X, y in batches:
+            if sum_x is None:
+                sum_x, xtx, xty = np.zeros(X.shape[1]), np.zeros((X.shape[1],) * 2), np.zeros(X.shape[1])
+            n += len(X)
+            sum_x += X.sum(axis=0)
+            sum_y += y.sum()
+            xtx += X.T @ X
+            xty += X.T @ y
+
+        # Center and scale from the accumulated moments: Cov = X'X/n - mean mean'
+        self.mean = sum_x / n
+        y_mean = sum_y / n
+        covariance = xtx / n - np.outer(self.mean, self.mean)
+        self.scale = np.sqrt(np.maximum(np.diag(covariance), 0))
+        self.scale[self.scale == 0] = 1.0
+        cross = xty / n - self.mean * y_mean
+
+        gram = covariance / np.outer(self.scale, self.scale)
+        coef_scaled = np.linalg.solve(gram + (self.alpha / n) * np.eye(len(gram)), cross / self.scale)
+        self.coef = coef_scaled / self.scale
+        self.intercept = y_mean - self.mean @ self.coef
+        return self
+
+    def fit(self, X, y, chunk_rows=CHUNK_ROWS):
+        return self.fit_batches((X[rows], y[rows]) for rows in _chunks(len(X), chunk_rows))
+
+    def predict(self, X, chunk_rows=CHUNK_ROWS):
+        """Predicted log1p(views) for every row"""
+        out = np.empty(len(X))
+        for rows in _chunks(len(X), chunk_rows):
+            out[rows] = X[rows] @ self.coef + self.intercept
+        return out
+
+    def predict_views(self, X, chunk_rows=CHUNK_ROWS):
+        return np.expm1(self.predict(X, chunk_rows))
+
+    def coefficients(self):
+        """Coefficients in standardized units (comparable effect sizes), largest first"""
+        table = pd.DataFrame({'feature': self.names or range(len(self.coef)),
+                              'coef': self.coef, 'standardized': self.coef * self.scale})
+        return table.reindex(table['standardized'].abs().sort_values(ascending=False).index)
+
+    def save(self, path):
+        np.savez(path, alpha=self.alpha, mean=self.mean, scale=self.scale, coef=self.coef,
+                 intercept=self.intercept, names=np.asarray(self.names or [], dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        model = cls(float(data['alpha']), data['names'].tolist() or None)
+        model.mean, model.scale, model.coef = data['mean'], data['scale'], data['coef']
+        model.intercept = float(data['intercept'])
+        return model
+
+
+def regression_metrics(y_true, y_pred):
+    """RMSE, MAE and R^2 on the log1p scale, plus median absolute percentage error on views"""
+    residual = y_true - y_pred
+    views, predicted = np.expm1(y_true), np.expm1(y_pred)
+    return {
+        'rmse_log': float(np.sqrt(np.mean(residual ** 2))),
+        'mae_log': float(np.mean(np.abs(residual))),
+        'r2': float(1 - residual.var() / y_true.var()) if y_true.var() > 0 else float('nan'),
+        'median_ape': float(np.median(np.abs(predicted - views) / np.maximum(views, 1))),
+    }
+
+
+def time_split(first_trending_day, last_trending_day, train_fraction=0.8):
+    """
+    Split at the train_fraction quantile of first trending days. Training rows
+    were last seen trending before the cutoff, so their peak views were known
+    by then; test rows first trend on or after it. Rows that straddle the
+    cutoff are left out.
+    """
+    cutoff = np.quantile(first_trending_day, train_fraction)
+    return np.flatnonzero(last_trending_day < cutoff), np.flatnonzero(first_trending_day >= cutoff), int(cutoff)
+
+
+def benchmark_scoring(model, store, target_rows=1_000_000, repeats=3):
+    """
+    Scoring throughput (rows/s) for the matrix product alone and for design
+    matrix construction plus scoring, on the store rows tiled to target_rows.
+    """
+    rows = np.resize(np.arange(len(store)), target_rows)
+    X = design_matrix(store, store.encodings, rows)
+    timings = {'predict': [], 'design_and_predict': []}
+    for _ in range(repeats):
+        start = datetime.now()
+        model.predict(X)
+        timings['predict'].append((datetime.now() - start).total_seconds())
+        start = datetime.now()
+        for chunk in _chunks(target_rows):
+            model.predict(design_matrix(store, store.encodings, rows[chunk]))
+        timings['design_and_predict'].append((datetime.now() - start).total_seconds())
+    return {name: target_rows / min(seconds) for name, seconds in timings.items()}
+
+
+def train_forecaster(store, alpha=FORECAST_ALPHA, train_fraction=0.8):
+    """
+    Fit on videos whose trending run ended before the cutoff and evaluate on
+    videos that first trend after it. The test metrics are reported next to
+    the persistence baseline (peak views = first-day views).
+    """
+    missing = [column for column in LOG_COLUMNS + NUMERIC_COLUMNS if column not in store.columns]
+    if missing:
+        raise KeyError(f"Feature store {store.version} has no {', '.join(missing)}; "
+                       f"rerun phase2_preprocessing.py to rebuild it with first-trending snapshots")
+    names = feature_names(store.encodings)
+    X = design_matrix(store, store.encodings)
+    y = np.log1p(np.asarray(store.column('views'), dtype=np.float64))
+    train, test, cutoff = time_split(np.asarray(store.column('first_trending_day')),
+                                     np.asarray(store.column('trending_day')), train_fraction)
+    model = RidgeForecaster(alpha, names).fit(X[train], y[train])
+    persistence = np.log1p(np.asarray(store.column('first_views'), dtype=np.float64))
+    metrics = {'train': regression_metrics(y[train], model.predict(X[train])),
+               'test': regression_metrics(y[test], model.predict(X[test])) if len(test) else {},
+               'test_persistence': regression_metrics(y[test], persistence[test]) if len(test) else {},
+               'train_rows': int(len(train)), 'test_rows': int(len(test)),
+               'cutoff_date': str(np.datetime64(cutoff, 'D'))}
+    return model, metrics
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("VIEWS FORECASTER")
+    print("=" * 80)
+    store = FeatureStore.open(FEATURE_STORE_DIR)
+    print(f"✓ Opened feature store {store.version} ({len(store):,} rows)")
+
+    start = datetime.now()
+    try:
+        model, metrics = train_forecaster(store)
+    except KeyError as e:
+        print(f"✗ Error: {e.args[0]}")
+        exit(1)
+    print(f"✓ Trained ridge forecaster (alpha={model.alpha}) on {metrics['train_rows']:,} videos last trending "
+          f"before {metrics['cutoff_date']} in {(datetime.now() - start).total_seconds():.2f}s")
+    for split in ['train', 'test', 'test_persistence']:
+        if metrics[split]:
+            print(f"  {split}: RMSE(log)={metrics[split]['rmse_log']:.3f}  R²={metrics[split]['r2']:.3f}  "
+                  f"median APE={metrics[split]['median_ape']:.1%}")
+    print("\nLargest standardized coefficients:")
+    print(model.coefficients().head(10).to_string(index=False))
+
+    throughput = benchmark_scoring(model, store)
+    metrics['throughput_rows_per_sec'] = throughput
+    print(f"\n✓ Scoring throughput: {throughput['predict']:,.0f} rows/s (prebuilt matrix), "
+          f"{throughput['design_and_predict']:,.0f} rows/s (including feature assembly)")
+
+    model.save('views_forecaster.npz')
+    with open('views_forecaster_metrics.json', 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2)
+    print("✓ Saved views_forecaster.npz and views_forecaster_metrics.json")
@@ -0,0 +1,91 @@
+"""
+Density-Binned Scatter Plots
+Aggregates large point clouds into a 2D histogram grid with NumPy
+
+The grid (plus a capped set of outlier points) is what goes into the plot
+spec, so spec size and render time depend on the grid size rather than on
+the number of rows.
+"""
+
+import numpy as np
+
+# Point clouds larger than this are binned instead of drawn point by point
+BINNED_SCATTER_THRESHOLD = 5000
+
+
+def _finite(x, y, log_x, log_y):
+    """Drop NaN/inf values, and non-positive values on log-scaled axes"""
+    mask = np.isfinite(x) & np.isfinite(y)
+    if log_x:
+        mask &= x > 0
+    if log_y:
+        mask &= y > 0
+    return x[mask], y[mask]
+
+
+def _edges(values, bins, log):
+    """Bin edges spanning the data, evenly spaced in linear or log10 space"""
+    lo, hi = values.min(), values.max()
+    if log:
+        lo, hi = np.log10(lo), np.log10(hi)
+    if hi <= lo:
+        hi = lo + 1.0
+    edges = np.linspace(lo, hi, bins + 1)
+    return 10 ** edges if log else edges
+
+
+def bin_scatter(x, y, bins=150, log_x=False, log_y=False, outlier_quantile=0.999,
+                max_outliers=500):
+    """
+    Bin (x, y) points into a bins x bins count grid.
+
+    Points outside the [1 - q, q] quantile range on either axis are returned
+    separately (at most max_outliers, the most extreme first) so they can be
+    overlaid as individual markers.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x, y = _finite(x, y, log_x, log_y)
+    if len(x) == 0:
+        return {'counts': [], 'x_edges': [], 'y_edges': [], 'outliers_x': [], 'outliers_y': [],
+                'n_points': 0}
+
+    x_edges = _edges(x, bins, log_x)
+    y_edges = _edges(y, bins, log_y)
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+
+    outliers_x, outliers_y = np.empty(0), np.empty(0)
+    if outlier_quantile:
+        tx = np.log10(x) if log_x else x
+        ty = np.log10(y) if log_y else y
+        x_lo, x_hi = np.quantile(tx, [1 - outlier_quantile, outlier_quantile])
+        y_lo, y_hi = np.quantile(ty, [1 - outlier_quantile, outlier_quantile])
+        mask = (tx < x_lo) | (tx > x_hi) | (ty < y_lo) | (ty > y_hi)
+        if mask.any():
+            # Rank by standardized distance from the median so the cap keeps the most extreme points
+            zx = (tx[mask] - np.median(tx)) / (tx.std() or 1.0)
+            zy = (ty[mask] - np.median(ty)) / (ty.std() or 1.0)
+            distance = np.hypot(zx, zy)
+            keep = np.argsort(distance)[::-1][:max_outliers]
+            outliers_x, outliers_y = x[mask][keep], y[mask][keep]
+
+    return {
+        'counts': counts.T.tolist(),
+        'x_edges': x_edges.tolist(),
+        'y_edges': y_edges.tolist(),
+        'outliers_x': outliers_x.tolist(),
+        'outliers_y': outliers_y.tolist(),
+        'n_points': int(len(x)),
+    }
+
+
+def scatter_panel_data(x, y, binned=None, **bin_options):
+    """
+    Return (kind, data) for a scatter panel, binning automatically when the
+    point count exceeds BINNED_SCATTER_THRESHOLD.
+    """
+    if binned is None:
+        binned = len(x) > BINNED_SCATTER_THRESHOLD
+    if binned:
+        return 'scatter_binned', bin_scatter(x, y, **bin_options)
+    return 'scatter', {'x': np.asarray(x).tolist(), 'y': np.asarray(y).tolist()}
@@ -0,0 +1,112 @@
+"""
+Vectorized Bootstrap Confidence Intervals
+Percentile bootstrap for group means/medians and pairwise differences
+
+Resamples are drawn as whole index matrices (resamples x n) and reduced
+with one NumPy call per batch, instead of one Python iteration per
+resample. Batches are sized so a batch holds at most MAX_BATCH_CELLS
+values, which keeps memory bounded for large groups.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Upper bound on resamples x group size held in memory at once
+MAX_BATCH_CELLS = 5_000_000
+
+STATISTICS = {
+    'mean': lambda samples: samples.mean(axis=1),
+    'median': lambda samples: np.median(samples, axis=1),
+}
+
+
+def bootstrap_distribution(values, statistic='mean', n_resamples=2000, rng=None):
+    """Bootstrap distribution (length n_resamples) of `statistic` over `values`"""
+    rng = rng if rng is not None else np.random.default_rng()
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return np.full(n_resamples, np.nan)
+
+    reduce = STATISTICS[statistic]
+    batch_size = max(1, MAX_BATCH_CELLS // n)
+    distribution = np.empty(n_resamples)
+    for start in range(0, n_resamples, batch_size):
+        stop = min(start + batch_size, n_resamples)
+        indices = rng.integers(0, n, size=(stop - start, n))
+        distribution[start:stop] = reduce(values[indices])
+    return distribution
+
+
+def percentile_interval(distribution, confidence=0.95):
+    """(lower, upper) percentile interval of a bootstrap distribution"""
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(distribution, [alpha, 1 - alpha])
+    return lower, upper
+
+
+def group_bootstrap(df, group_col, metric, statistic='mean', n_resamples=2000,
+                    confidence=0.95, seed=42):
+    """
+    Bootstrap `statistic` of `metric` for every group.
+
+    Returns (intervals, distributions): a DataFrame with one row per group
+    (estimate, ci_lower, ci_upper, n) and a dict of group -> distribution for
+    use with pairwise_differences().
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    distributions = {}
+    for group, values in df.groupby(group_col, observed=True)[metric]:
+        values = values.dropna().to_numpy(dtype=float)
+        distribution = bootstrap_distribution(values, statistic, n_resamples, rng)
+        lower, upper = percentile_interval(distribution, confidence)
+        estimate = STATISTICS[statistic](values[np.newaxis, :])[0] if len(values) else np.nan
+        distributions[group] = distribution
+        rows.append({group_col: group, 'metric': metric, 'statistic': statistic,
+                     'estimate': estimate, 'ci_lower': lower, 'ci_upper': upper,
+                     'n': len(values)})
+    return pd.DataFrame(rows), distributions
+
+
+def pairwise_differences(distributions, confidence=0.95, group_col='group'):
+    """
+    Interval for the difference of every pair of groups.
+
+    Groups are resampled independently, so the difference of their bootstrap
+    distributions is a bootstrap distribution of the difference. A pair is
+    flagged significant when its interval excludes zero.
+    """
+    rows = []
+    for a, b in itertools.combinations(distributions, 2):
+        difference = distributions[a] - distributions[b]
+        lower, upper = percentile_interval(difference, confidence)
+        rows.append({f'{group_col}_a': a, f'{group_col}_b': b,
+                     'difference': np.nanmedian(difference), 'ci_lower': lower, 'ci_upper': upper,
+                     'prob_a_greater': float(np.mean(difference > 0)),
+                     'significant': bool(lower > 0 or upper < 0)})
+    return pd.DataFrame(rows)
+
+
+def leader_summary(intervals, differences, group_col, confidence=0.95):
+    """
+    Describe the top group by estimate and whether its lead over the
+    runner-up is distinguishable from resampling noise.
+    """
+    ranked = intervals.sort_values('estimate', ascending=False).reset_index(drop=True)
+    leader = ranked.iloc[0]
+    text = (f"{leader[group_col]} ({leader['estimate']:.4g}, {confidence:.0%} CI "
+            f"{leader['ci_lower']:.4g} to {leader['ci_upper']:.4g})")
+    if len(ranked) < 2:
+        return text
+    runner_up = ranked.iloc[1][group_col]
+    pair = differences[((differences[f'{group_col}_a'] == leader[group_col]) &
+                        (differences[f'{group_col}_b'] == runner_up)) |
+                       ((differences[f'{group_col}_a'] == runner_up) &
+                        (differences[f'{group_col}_b'] == leader[group_col]))]
+    if len(pair) and pair.iloc[0]['significant']:
+        return text + f"; lead over {runner_up} is significant"
+    return text + f"; lead over {runner_up} is not significant"
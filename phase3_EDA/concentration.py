@@ -0,0 +1,77 @@
+"""
+Market Concentration
+Gini and Herfindahl-Hirschman indices of a value across entities, for every group at once
+
+Rows (one per group and entity, e.g. views per channel within a country x
+category x week cell) are sorted once by (group, value). Within-group ranks
+come from position offsets, and every per-group sum is an np.bincount over
+the group IDs, so all cells are computed in one pass:
+
+- HHI:  sum of squared shares, sum(x^2) / sum(x)^2 (1 = one entity holds everything)
+- Gini: 2 * sum(rank * x) / (n * sum(x)) - (n + 1) / n, ranks 1..n in ascending order
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def concentration(df, group_cols, value_col, entity_col=None):
+    """
+    Concentration of value_col across entities within each group.
+
+    With entity_col, values are first summed per (group, entity); otherwise
+    each row is one entity. Returns one row per group with entities, total,
+    top_share, hhi, effective_entities (1 / HHI) and gini. Groups whose total
+    is zero get NaN shares.
+    """
+    group_cols = list(group_cols)
+    if entity_col is not None:
+        df = df.groupby(group_cols + [entity_col], observed=True, sort=False)[value_col].sum().reset_index()
+    values = df[value_col].to_numpy(dtype=np.float64)
+    grouped = df.groupby(group_cols, observed=True, sort=True)
+    group_ids = grouped.ngroup().to_numpy()
+    labels = grouped.size().index.to_frame(index=False)
+    valid = (group_ids >= 0) & ~np.isnan(values)
+    values, group_ids = values[valid], group_ids[valid]
+    n_groups = len(labels)
+
+    order = np.lexsort((values, group_ids))
+    values, group_ids = values[order], group_ids[order]
+    sizes = np.bincount(group_ids, minlength=n_groups)
+    starts = np.cumsum(sizes) - sizes
+    ranks = np.arange(len(values)) - starts[group_ids] + 1
+
+    totals = np.bincount(group_ids, values, minlength=n_groups)
+    squares = np.bincount(group_ids, values ** 2, minlength=n_groups)
+    weighted = np.bincount(group_ids, ranks * values, minlength=n_groups)
+    # Sorted ascending, so each group's maximum is its last row
+    largest = np.zeros(n_groups)
+    nonempty = sizes > 0
+    largest[nonempty] = values[starts[nonempty] + sizes[nonempty] - 1]
+
+    positive = totals > 0
+    safe_totals = np.where(positive, totals, 1)
+    hhi = np.where(positive, squares / safe_totals ** 2, np.nan)
+    gini = np.where(positive, 2 * weighted / (np.maximum(sizes, 1) * safe_totals) - (sizes + 1) / np.maximum(sizes, 1),
+                    np.nan)
+
+    result = labels
+    result.columns = group_cols
+    result['entities'] = sizes
+    result['total'] = totals
+    result['top_share'] = np.where(positive, largest / safe_totals, np.nan)
+    result['hhi'] = hhi
+    result['effective_entities'] = 1 / hhi
+    result['gini'] = gini
+    return result
+
+
+def channel_concentration(cube, value='views', by=('country', 'category_name', 'trending_week')):
+    """
+    Concentration of a measure's total across channels for every cell of `by`,
+    from the OLAP cube's per-channel sums.
+    """
+    per_channel = cube.query(list(by) + ['channel_title'], [value], stats=('sum',))
+    result = concentration(per_channel, by, f'{value}_sum')
+    return result.rename(columns={'entities': 'channels', 'effective_entities': 'effective_channels',
+                                  'total': f'total_{value}'})
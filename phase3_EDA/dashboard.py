@@ -0,0 +1,260 @@
+"""
+Interactive EDA Dashboard
+Self-contained Plotly HTML dashboard built from the OLAP cube
+
+Only pre-aggregated cuboids are embedded (as dictionary-encoded column
+arrays), never raw rows, so the page size depends on the number of
+country x category x week and channel cells rather than on the number of
+videos. Country, category and week-range filters re-aggregate those arrays
+in the browser and redraw with Plotly.react; the channel scatter uses a
+WebGL (Scattergl) trace so thousands of points stay responsive.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.offline
+
+COUNTRY_COLORS = {'US': '#FF6B6B', 'GB': '#4ECDC4', 'CA': '#45B7D1', 'IN': '#FFA07A'}
+
+
+def _encode(cuboid, dims, measures):
+    """Dictionary-encode dimension columns and keep measure columns as plain lists"""
+    columns = {}
+    labels = {}
+    for dim in dims:
+        codes, uniques = pd.factorize(cuboid[dim].astype(str), sort=True)
+        columns[dim] = codes.tolist()
+        labels[dim] = uniques.tolist()
+    for measure in measures:
+        values = cuboid[measure].to_numpy(dtype=float)
+        columns[measure] = np.where(np.isnan(values), 0, values).tolist()
+    return columns, labels
+
+
+def dashboard_data(cube):
+    """Compact payload: weekly and channel cuboids plus the label tables their codes index into"""
+    weekly_dims = ['country', 'category_name', 'trending_week']
+    channel_dims = ['country', 'category_name', 'channel_title']
+    weekly_cuboid = cube.materialize(weekly_dims)
+    channel_cuboid = cube.materialize(channel_dims)
+
+    weekly, weekly_labels = _encode(
+        weekly_cuboid, weekly_dims,
+        ['rows', 'views__sum', 'likes__sum', 'engagement_ratio__sum', 'engagement_ratio__count'])
+    channels, channel_labels = _encode(
+        channel_cuboid, channel_dims, ['rows', 'views__sum', 'likes__sum'])
+
+    # Both cuboids must share one code table for country and category
+    countries = sorted(set(weekly_labels['country']) | set(channel_labels['country']))
+    categories = sorted(set(weekly_labels['category_name']) | set(channel_labels['category_name']))
+    for columns, labels in ((weekly, weekly_labels), (channels, channel_labels)):
+        for dim, table in (('country', countries), ('category_name', categories)):
+            remap = [table.index(label) for label in labels[dim]]
+            columns[dim] = [remap[code] for code in columns[dim]]
+
+    return {
+        'countries': countries,
+        'categories': categories,
+        'weeks': weekly_labels['trending_week'],
+        'channel_names': channel_labels['channel_title'],
+        'weekly': weekly,
+        'channels': channels,
+        'colors': COUNTRY_COLORS,
+    }
+
+
+def dashboard_figures():
+    """Empty figure templates (layout and trace types); data is filled in by the page script"""
+    weekly = go.Figure(layout=go.Layout(
+        title='Trending Videos per Week by Country', xaxis_title='Week',
+        yaxis_title='Number of Trending Videos', hovermode='x unified'))
+    categories = go.Figure(data=[go.Bar(orientation='h')], layout=go.Layout(
+        title='Trending Videos by Category', xaxis_title='Number of Videos',
+        yaxis=dict(autorange='reversed'), margin=dict(l=160)))
+    countries = go.Figure(data=[go.Bar()], layout=go.Layout(
+        title='Average Views and Engagement by Country', yaxis_title='Average Views',
+        yaxis2=dict(title='Average Engagement Ratio', overlaying='y', side='right'),
+        barmode='group'))
+    channels = go.Figure(data=[go.Scattergl(mode='markers')], layout=go.Layout(
+        title='Channels: Average Views vs Average Likes (WebGL)', xaxis=dict(type='log', title='Average Views'),
+        yaxis=dict(type='log', title='Average Likes'), hovermode='closest'))
+    return {name: json.loads(fig.to_json()) for name, fig in
+            (('weekly', weekly), ('categories', categories), ('countries', countries),
+             ('channels', channels))}
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>YouTube Trending - EDA Dashboard</title>
+__PLOTLYJS__
+<style>
+  body { font-family: Arial, sans-serif; margin: 16px; background: #fafafa; }
+  h1 { font-size: 22px; margin: 0 0 12px 0; }
+  .filters { display: flex; gap: 24px; flex-wrap: wrap; background: #fff; padding: 12px;
+             border: 1px solid #ddd; border-radius: 4px; margin-bottom: 12px; }
+  .filters label { margin-right: 8px; }
+  .filters select[multiple] { min-width: 200px; height: 110px; }
+  .grid { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; }
+  .chart { background: #fff; border: 1px solid #ddd; border-radius: 4px; height: 460px; }
+  .note { color: #666; font-size: 12px; }
+</style>
+</head>
+<body>
+<h1>YouTube Trending - EDA Dashboard</h1>
+<div class="filters">
+  <div><b>Country</b><br><span id="country-filter"></span></div>
+  <div><b>Category</b><br><select id="category-filter" multiple></select></div>
+  <div><b>Weeks</b><br>
+    from <select id="week-start"></select> to <select id="week-end"></select>
+    <p class="note">Week filter applies to the weekly, category and country charts.</p>
+  </div>
+  <div><p class="note" id="selection-summary"></p></div>
+</div>
+<div class="grid">
+  <div id="weekly" class="chart"></div>
+  <div id="categories" class="chart"></div>
+  <div id="countries" class="chart"></div>
+  <div id="channels" class="chart"></div>
+</div>
+<script>
+const DATA = __DATA__;
+const FIGURES = __FIGURES__;
+
+function selectedCountries() {
+  return new Set(Array.from(document.querySelectorAll('#country-filter input:checked'), el => +el.value));
+}
+function selectedCategories() {
+  const chosen = Array.from(document.getElementById('category-filter').selectedOptions, el => +el.value);
+  return new Set(chosen.length ? chosen : DATA.categories.map((_, i) => i));
+}
+
+function render() {
+  const countries = selectedCountries();
+  const categories = selectedCategories();
+  const w0 = +document.getElementById('week-start').value;
+  const w1 = +document.getElementById('week-end').value;
+  const nW = DATA.weeks.length, nK = DATA.categories.length, nC = DATA.countries.length;
+
+  const weekly = DATA.weekly;
+  const perWeek = DATA.countries.map(() => new Float64Array(nW));
+  const perCategory = new Float64Array(nK);
+  const countryRows = new Float64Array(nC), countryViews = new Float64Array(nC);
+  const countryEng = new Float64Array(nC), countryEngN = new Float64Array(nC);
+  let total = 0;
+  for (let i = 0; i < weekly.rows.length; i++) {
+    const c = weekly.country[i], k = weekly.category_name[i], w = weekly.trending_week[i];
+    if (!countries.has(c) || !categories.has(k) || w < w0 || w > w1) continue;
+    const n = weekly.rows[i];
+    perWeek[c][w] += n;
+    perCategory[k] += n;
+    countryRows[c] += n;
+    countryViews[c] += weekly['views__sum'][i];
+    countryEng[c] += weekly['engagement_ratio__sum'][i];
+    countryEngN[c] += weekly['engagement_ratio__count'][i];
+    total += n;
+  }
+
+  const weeks = DATA.weeks.slice(w0, w1 + 1);
+  const weeklyTraces = [];
+  DATA.countries.forEach((name, c) => {
+    if (!countries.has(c)) return;
+    weeklyTraces.push({type: 'scatter', mode: 'lines+markers', name: name, x: weeks,
+                       y: Array.from(perWeek[c].slice(w0, w1 + 1)),
+                       line: {color: DATA.colors[name]}});
+  });
+  Plotly.react('weekly', weeklyTraces, FIGURES.weekly.layout, {responsive: true});
+
+  const order = DATA.categories.map((_, k) => k).filter(k => perCategory[k] > 0)
+                  .sort((a, b) => perCategory[b] - perCategory[a]);
+  Plotly.react('categories', [{type: 'bar', orientation: 'h',
+                               y: order.map(k => DATA.categories[k]),
+                               x: order.map(k => perCategory[k])}],
+               FIGURES.categories.layout, {responsive: true});
+
+  const shown = DATA.countries.map((_, c) => c).filter(c => countries.has(c) && countryRows[c] > 0);
+  Plotly.react('countries', [
+    {type: 'bar', name: 'Average Views', x: shown.map(c => DATA.countries[c]),
+     y: shown.map(c => countryViews[c] / countryRows[c]), offsetgroup: 0,
+     marker: {color: shown.map(c => DATA.colors[DATA.countries[c]])}},
+    {type: 'bar', name: 'Average Engagement Ratio', x: shown.map(c => DATA.countries[c]),
+     y: shown.map(c => countryEngN[c] ? countryEng[c] / countryEngN[c] : null),
+     yaxis: 'y2', offsetgroup: 1, marker: {color: '#888'}}
+  ], FIGURES.countries.layout, {responsive: true});
+
+  const channels = DATA.channels;
+  const nCh = DATA.channel_names.length;
+  const chRows = new Float64Array(nCh), chViews = new Float64Array(nCh), chLikes = new Float64Array(nCh);
+  for (let i = 0; i < channels.rows.length; i++) {
+    if (!countries.has(channels.country[i]) || !categories.has(channels.category_name[i])) continue;
+    const ch = channels.channel_title[i];
+    chRows[ch] += channels.rows[i];
+    chViews[ch] += channels['views__sum'][i];
+    chLikes[ch] += channels['likes__sum'][i];
+  }
+  const x = [], y = [], text = [], size = [];
+  for (let ch = 0; ch < nCh; ch++) {
+    if (!chRows[ch] || chViews[ch] <= 0 || chLikes[ch] <= 0) continue;
+    x.push(chViews[ch] / chRows[ch]);
+    y.push(chLikes[ch] / chRows[ch]);
+    text.push(DATA.channel_names[ch] + ' (' + chRows[ch] + ' videos)');
+    size.push(Math.min(4 + Math.sqrt(chRows[ch]), 20));
+  }
+  Plotly.react('channels', [{type: 'scattergl', mode: 'markers', x: x, y: y, text: text,
+                             hoverinfo: 'text+x+y', marker: {size: size, opacity: 0.6}}],
+               FIGURES.channels.layout, {responsive: true});
+
+  document.getElementById('selection-summary').textContent =
+    total.toLocaleString() + ' trending videos, ' + x.length.toLocaleString() + ' channels in selection';
+}
+
+function init() {
+  const countryFilter = document.getElementById('country-filter');
+  DATA.countries.forEach((name, c) => {
+    const label = document.createElement('label');
+    label.innerHTML = '<input type="checkbox" value="' + c + '" checked> ' + name;
+    countryFilter.appendChild(label);
+  });
+  const categoryFilter = document.getElementById('category-filter');
+  DATA.categories.forEach((name, k) => categoryFilter.add(new Option(name, k)));
+  ['week-start', 'week-end'].forEach((id, j) => {
+    const select = document.getElementById(id);
+    DATA.weeks.forEach((week, w) => select.add(new Option(week, w)));
+    select.value = j === 0 ? 0 : DATA.weeks.length - 1;
+  });
+  document.querySelectorAll('.filters input, .filters select').forEach(el => el.addEventListener('change', render));
+  render();
+}
+init();
+</script>
+</body>
+</html>
+"""
+
+
+def build_dashboard(cube, path, plotlyjs='inline'):
+    """
+    Write the dashboard HTML to `path`.
+
+    plotlyjs='inline' embeds plotly.js so the file works offline; 'cdn' links
+    to the matching plotly.js release instead, for a much smaller file.
+    """
+    if plotlyjs == 'cdn':
+        script = (f'<script src="https://cdn.plot.ly/plotly-'
+                  f'{plotly.offline.get_plotlyjs_version()}.min.js"></script>')
+    else:
+        script = f'<script type="text/javascript">{plotly.offline.get_plotlyjs()}</script>'
+
+    # '<\/' keeps labels such as '</script>' from closing the inline script early
+    data = json.dumps(dashboard_data(cube), separators=(',', ':')).replace('</', '<\\/')
+    figures = json.dumps(dashboard_figures(), separators=(',', ':')).replace('</', '<\\/')
+    html = (PAGE_TEMPLATE.replace('__FIGURES__', figures)
+            .replace('__DATA__', data)
+            .replace('__PLOTLYJS__', script))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return len(data)
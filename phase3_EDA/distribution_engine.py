@@ -0,0 +1,181 @@
+"""
+Shared Distribution Engine
+Cached bin counts, FFT-based binned KDEs and box statistics
+
+Histograms, KDEs and boxplot statistics are computed with NumPy once per
+(column, transform, group, binning) and cached, and the precomputed
+results go into the plot specs. Every chart showing the same column and
+group therefore uses identical bins, and matplotlib never re-bins the raw
+values.
+
+KDEs are binned: values are linearly binned onto a regular grid and
+convolved with a Gaussian kernel via FFT, so the cost is O(n + g log g)
+for n values and a g-point grid.
+"""
+
+import numpy as np
+
+DEFAULT_BINS = 50
+KDE_GRID_SIZE = 512
+
+# Boxplots keep at most this many fliers (the most extreme ones) per box
+MAX_FLIERS = 1000
+
+TRANSFORMS = {
+    None: lambda values: values,
+    'log10p': lambda values: np.log10(values + 1),
+}
+
+
+def histogram_edges(values, bins=DEFAULT_BINS, value_range=None):
+    """Evenly spaced bin edges over value_range (or the data range)"""
+    lo, hi = value_range if value_range is not None else (values.min(), values.max())
+    if hi <= lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def silverman_bandwidth(values):
+    """Silverman's rule of thumb: 0.9 * min(std, IQR / 1.34) * n^(-1/5)"""
+    n = len(values)
+    std = values.std(ddof=1) if n > 1 else 0.0
+    q75, q25 = np.percentile(values, [75, 25])
+    spread = min(std, (q75 - q25) / 1.34) or std or 1.0
+    return 0.9 * spread * n ** (-0.2)
+
+
+def binned_kde(values, grid_size=KDE_GRID_SIZE, bandwidth=None, value_range=None):
+    """
+    Gaussian KDE evaluated on a regular grid via linear binning and FFT convolution.
+
+    Returns (grid, density) where density integrates to ~1 over the grid.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    bandwidth = bandwidth or silverman_bandwidth(values)
+    lo, hi = value_range if value_range is not None else (values.min(), values.max())
+    lo, hi = lo - 3 * bandwidth, hi + 3 * bandwidth
+    grid = np.linspace(lo, hi, grid_size)
+    delta = grid[1] - grid[0]
+
+    # Linear binning: split each value's unit weight between its two neighbouring grid points
+    position = np.clip((values - lo) / delta, 0, grid_size - 1)
+    left = np.minimum(np.floor(position).astype(np.int64), grid_size - 2)
+    right_weight = position - left
+    weights = (np.bincount(left, 1 - right_weight, minlength=grid_size) +
+               np.bincount(left + 1, right_weight, minlength=grid_size))
+
+    # Gaussian kernel sampled on the grid out to 4 bandwidths, convolved via zero-padded FFT
+    half_width = min(int(np.ceil(4 * bandwidth / delta)), grid_size - 1)
+    offsets = np.arange(-half_width, half_width + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    size = grid_size + len(kernel) - 1
+    fft_size = 1 << (size - 1).bit_length()
+    smoothed = np.fft.irfft(np.fft.rfft(weights, fft_size) * np.fft.rfft(kernel, fft_size), fft_size)
+    density = smoothed[half_width:half_width + grid_size] / n
+    return grid, np.maximum(density, 0)
+
+
+def box_stats(values, label=None, whis=1.5, max_fliers=MAX_FLIERS):
+    """Statistics for matplotlib's Axes.bxp: quartiles, median, whiskers and fliers"""
+    values = np.asarray(values, dtype=float)
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low_limit, high_limit = q1 - whis * iqr, q3 + whis * iqr
+    inside = values[(values >= low_limit) & (values <= high_limit)]
+    fliers = values[(values < low_limit) | (values > high_limit)]
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.argsort(np.abs(fliers - med))[-max_fliers:]]
+    return {
+        'label': label,
+        'med': float(med), 'q1': float(q1), 'q3': float(q3),
+        'whislo': float(inside.min()) if len(inside) else float(q1),
+        'whishi': float(inside.max()) if len(inside) else float(q3),
+        'mean': float(values.mean()),
+        'fliers': fliers.tolist(),
+    }
+
+
+class DistributionCache:
+    """
+    Histogram, KDE and box statistics for the columns of one DataFrame,
+    computed on first use and reused by every later plot.
+    """
+
+    def __init__(self, df, group_col='country'):
+        self.df = df
+        self.group_col = group_col
+        self._store = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key, compute):
+        if key in self._store:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._store[key] = compute()
+        return self._store[key]
+
+    def values(self, column, group=None, transform=None):
+        """Non-null (optionally transformed) values of a column, overall or for one group"""
+        def compute():
+            series = self.df[column] if group is None else \
+                self.df.loc[self.df[self.group_col] == group, column]
+            values = TRANSFORMS[transform](series.dropna().to_numpy(dtype=float))
+            return values[np.isfinite(values)]
+        return self._cached(('values', column, transform, group), compute)
+
+    def value_range(self, column, transform=None):
+        """(min, max) over all groups, so per-group histograms can share bin edges"""
+        def compute():
+            values = self.values(column, transform=transform)
+            return (float(values.min()), float(values.max())) if len(values) else (0.0, 1.0)
+        return self._cached(('range', column, transform), compute)
+
+    def histogram(self, column, group=None, bins=DEFAULT_BINS, transform=None, shared_range=False):
+        """(counts, edges) for a column; shared_range uses the all-groups range for the edges"""
+        value_range = self.value_range(column, transform) if shared_range else None
+
+        def compute():
+            values = self.values(column, group, transform)
+            if len(values) == 0:
+                return np.zeros(bins), histogram_edges(np.zeros(1), bins, value_range)
+            edges = histogram_edges(values, bins, value_range)
+            counts, _ = np.histogram(values, bins=edges)
+            return counts, edges
+        return self._cached(('hist', column, transform, group, bins, value_range), compute)
+
+    def kde(self, column, group=None, transform=None, grid_size=KDE_GRID_SIZE):
+        """(grid, density) binned KDE for a column"""
+        def compute():
+            values = self.values(column, group, transform)
+            if len(values) < 2:
+                return np.empty(0), np.empty(0)
+            return binned_kde(values, grid_size)
+        return self._cached(('kde', column, transform, group, grid_size), compute)
+
+    def box(self, column, group=None, transform=None, label=None):
+        """bxp statistics for a column"""
+        def compute():
+            values = self.values(column, group, transform)
+            return box_stats(values, label=label or (group if group is not None else column))
+        return self._cached(('box', column, transform, group), compute)
+
+    def hist_series(self, column, group=None, bins=DEFAULT_BINS, transform=None,
+                    shared_range=False, kde=False, label=None):
+        """
+        Plot-ready histogram series for the 'hist_binned' chart kind, optionally
+        with the KDE scaled to the histogram's counts per bin.
+        """
+        counts, edges = self.histogram(column, group, bins, transform, shared_range)
+        series = {'label': label, 'counts': np.asarray(counts).tolist(), 'edges': edges.tolist()}
+        if kde:
+            grid, density = self.kde(column, group, transform)
+            scale = len(self.values(column, group, transform)) * (edges[1] - edges[0])
+            series['kde'] = {'x': grid.tolist(), 'y': (density * scale).tolist()}
+        return series
+
+    def summary(self):
+        return f"{self.misses} computed, {self.hits} reused"
+
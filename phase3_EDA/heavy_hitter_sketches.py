@@ -0,0 +1,156 @@
+"""
+Per-Day Heavy-Hitter Sketches
+Bounded-memory Space-Saving summaries of tags and channels per country and day
+
+Each (country, day) gets a streaming_stats.HeavyHitters summary holding at
+most `capacity` items with per-item error bounds. Summaries merge by
+addition, so weekly, monthly or all-time rankings come from merging daily
+sketches instead of rescanning rows, and new days can be appended as they
+arrive. Sketches are persisted as JSON next to the other EDA outputs.
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from streaming_stats import HeavyHitters
+from tag_frequency import intern_tag_occurrences
+
+DEFAULT_CAPACITY = 500
+
+
+class SketchStore:
+    """HeavyHitters sketches keyed by (country, day), for one kind of item (tags or channels)"""
+
+    def __init__(self, kind, capacity=DEFAULT_CAPACITY):
+        self.kind = kind
+        self.capacity = capacity
+        self.sketches = {}
+
+    def add_counts(self, country, day, counts):
+        """Fold exact counts for one (country, day) partition into its sketch"""
+        partial = HeavyHitters.from_counts(counts, self.capacity)
+        key = (country, day)
+        if key in self.sketches:
+            self.sketches[key].merge(partial)
+        else:
+            self.sketches[key] = partial
+
+    def merge_range(self, country=None, start=None, end=None):
+        """Merge daily sketches for a country (None = all) between start and end days (inclusive)"""
+        merged = HeavyHitters(self.capacity)
+        for (sketch_country, day), sketch in self.sketches.items():
+            if country is not None and sketch_country != country:
+                continue
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            merged.merge(sketch)
+        return merged
+
+    def top_k(self, k=10, country=None, start=None, end=None):
+        """
+        Approximate top-k items with bounds: DataFrame of item, count (upper
+        bound), guaranteed (lower bound) and error, ranked by guaranteed count
+        so items inflated by merge error don't crowd out true heavy hitters.
+        """
+        merged = self.merge_range(country, start, end)
+        ranked = sorted(((item, n, merged.errors[item]) for item, n in merged.counts.items()),
+                        key=lambda entry: (entry[2] - entry[1], -entry[1], str(entry[0])))[:k]
+        return pd.DataFrame({
+            'item': [item for item, _, _ in ranked],
+            'count': [n for _, n, _ in ranked],
+            'guaranteed': [n - error for _, n, error in ranked],
+            'error': [error for _, _, error in ranked],
+        })
+
+    def days(self):
+        return sorted({day for _, day in self.sketches})
+
+    def save(self, path):
+        state = {'kind': self.kind, 'capacity': self.capacity,
+                 'sketches': [{'country': country, 'day': day, 'sketch': sketch.to_dict()}
+                              for (country, day), sketch in sorted(self.sketches.items())]}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        store = cls(state['kind'], state['capacity'])
+        for entry in state['sketches']:
+            store.sketches[(entry['country'], entry['day'])] = HeavyHitters.from_dict(entry['sketch'])
+        return store
+
+
+def _day_strings(dates):
+    return pd.to_datetime(dates).dt.strftime('%Y-%m-%d').to_numpy()
+
+
+def _add_partition_counts(store, countries, days, items):
+    """Count (country, day, item) triples in one groupby and feed each partition to the store"""
+    counts = pd.DataFrame({'country': countries, 'day': days, 'item': items}) \
+        .groupby(['country', 'day', 'item'], sort=False).size()
+    for (country, day), partition in counts.groupby(level=[0, 1], sort=False):
+        store.add_counts(country, day, dict(zip(partition.index.get_level_values(2), partition.to_numpy())))
+    return store
+
+
+def build_tag_sketches(df, capacity=DEFAULT_CAPACITY, tags_col='tags_list', group_col='country',
+                       date_col='trending_date'):
+    """Daily tag sketches per country from interned tag occurrences"""
+    row_ids, _, tag_ids, _, tags = intern_tag_occurrences(df, tags_col, group_col)
+    tags = np.asarray(tags, dtype=object)
+    countries = df[group_col].to_numpy()[row_ids]
+    days = _day_strings(df[date_col])[row_ids]
+    return _add_partition_counts(SketchStore('tags', capacity), countries, days, tags[tag_ids])
+
+
+def build_channel_sketches(df, capacity=DEFAULT_CAPACITY, channel_col='channel_title',
+                           group_col='country', date_col='trending_date'):
+    """Daily channel sketches per country (one count per trending video row)"""
+    valid = df[channel_col].notna().to_numpy()
+    return _add_partition_counts(SketchStore('channels', capacity),
+                                 df[group_col].to_numpy()[valid],
+                                 _day_strings(df[date_col])[valid],
+                                 df[channel_col].to_numpy()[valid])
+
+
+def weekly_rankings(store, k=10, countries=None):
+    """Top-k per country and ISO week (Monday start), built by merging daily sketches"""
+    days = pd.to_datetime(pd.Series(store.days()))
+    if len(days) == 0:
+        return pd.DataFrame()
+    weeks = sorted(set((days - pd.to_timedelta(days.dt.dayofweek, unit='D')).dt.strftime('%Y-%m-%d')))
+    countries = countries or sorted({country for country, _ in store.sketches})
+    frames = []
+    for country in countries:
+        for week in weeks:
+            end = (pd.Timestamp(week) + pd.Timedelta(days=6)).strftime('%Y-%m-%d')
+            ranking = store.top_k(k, country, week, end)
+            if len(ranking):
+                frames.append(ranking.assign(kind=store.kind, country=country, week=week,
+                                             rank=np.arange(1, len(ranking) + 1)))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)[['kind', 'country', 'week', 'rank', 'item', 'count',
+                                                 'guaranteed', 'error']]
+
+
+def save_sketches(stores, directory):
+    """Write each store to <directory>/<kind>.json"""
+    os.makedirs(directory, exist_ok=True)
+    for store in stores:
+        store.save(os.path.join(directory, f"{store.kind}.json"))
+
+
+def load_sketches(directory):
+    """Load every store written by save_sketches(), keyed by kind"""
+    stores = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            store = SketchStore.load(os.path.join(directory, name))
+            stores[store.kind] = store
+    return stores
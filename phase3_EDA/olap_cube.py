@@ -0,0 +1,220 @@
+"""
+OLAP Cube
+Pre-aggregated additive measures over country, category, day, week and channel
+
+The cube is built in one pass over the cleaned rows: the base cuboid holds
+count, sum, sum of squares, min and max of every measure for each distinct
+(country, category, day-of-week, week, channel) combination. Coarser
+cuboids are rolled up from the base cuboid, never from the raw rows.
+
+Because every stored measure is additive (or min/max), any roll-up can be
+answered from any finer cuboid, and mean/std follow from count, sum and
+sum of squares. OLAPCube.query() picks the smallest materialized cuboid that
+covers the requested dimensions and filters.
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ['country', 'category_name', 'trending_day_of_week', 'trending_week', 'channel_title']
+MEASURES = ['views', 'likes', 'dislikes', 'comment_count', 'engagement_ratio', 'like_dislike_ratio']
+
+# Cuboids materialized alongside the base cuboid (the groupings phase 3 and 5 ask for)
+DEFAULT_CUBOIDS = [
+    (),
+    ('country',),
+    ('category_name',),
+    ('country', 'category_name'),
+    ('country', 'trending_day_of_week'),
+    ('country', 'trending_week'),
+    ('country', 'trending_week', 'category_name'),
+    ('country', 'channel_title'),
+    ('country', 'category_name', 'channel_title'),
+]
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MANIFEST = 'cube_manifest.json'
+
+
+def _stat_columns(measure):
+    return {
+        'count': f'{measure}__count',
+        'sum': f'{measure}__sum',
+        'sumsq': f'{measure}__sumsq',
+        'min': f'{measure}__min',
+        'max': f'{measure}__max',
+    }
+
+
+def _rollup_aggregations(measures):
+    """How each stored column combines when rows of a cuboid are merged"""
+    aggregations = {'rows': 'sum'}
+    for measure in measures:
+        columns = _stat_columns(measure)
+        aggregations.update({columns['count']: 'sum', columns['sum']: 'sum',
+                             columns['sumsq']: 'sum', columns['min']: 'min',
+                             columns['max']: 'max'})
+    return aggregations
+
+
+def prepare_dimensions(df):
+    """Add the derived trending_week dimension (week start date, ISO string)"""
+    df = df.copy()
+    trending_date = pd.to_datetime(df['trending_date'])
+    df['trending_week'] = trending_date.dt.to_period('W').dt.start_time.dt.strftime('%Y-%m-%d')
+    df['trending_day_of_week'] = df['trending_day_of_week'].astype(str)
+    return df
+
+
+def _rollup(cuboid, dims, measures):
+    """Aggregate a cuboid down to `dims`"""
+    aggregations = _rollup_aggregations(measures)
+    if not dims:
+        return cuboid[list(aggregations)].agg(aggregations).to_frame().T.reset_index(drop=True)
+    return cuboid.groupby(list(dims), observed=True, sort=True, dropna=False).agg(aggregations).reset_index()
+
+
+class OLAPCube:
+    """A set of cuboids keyed by their (sorted by DIMENSIONS order) dimension tuple"""
+
+    def __init__(self, cuboids, dimensions=None, measures=None):
+        self.cuboids = cuboids
+        self.dimensions = list(dimensions or DIMENSIONS)
+        self.measures = list(measures or MEASURES)
+
+    # ------------------------------------------------------------------
+    # Building and persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, df, dimensions=None, measures=None, cuboids=None):
+        """Build the base cuboid in one grouped pass and roll up the materialized cuboids"""
+        dimensions = list(dimensions or DIMENSIONS)
+        measures = list(measures or MEASURES)
+
+        values = pd.DataFrame({dim: df[dim] for dim in dimensions})
+        values['rows'] = 1
+        aggregations = {'rows': 'sum'}
+        for measure in measures:
+            columns = _stat_columns(measure)
+            series = df[measure].astype(float)
+            values[columns['count']] = series.notna().astype(np.int64)
+            values[columns['sum']] = series
+            values[columns['sumsq']] = series ** 2
+            values[columns['min']] = series
+            values[columns['max']] = series
+            aggregations.update({columns['count']: 'sum', columns['sum']: 'sum',
+                                 columns['sumsq']: 'sum', columns['min']: 'min',
+                                 columns['max']: 'max'})
+
+        base = values.groupby(dimensions, observed=True, sort=True, dropna=False).agg(aggregations).reset_index()
+        cube = cls({tuple(dimensions): base}, dimensions, measures)
+        for dims in (DEFAULT_CUBOIDS if cuboids is None else cuboids):
+            cube.materialize(dims)
+        return cube
+
+    def _key(self, dims):
+        return tuple(dim for dim in self.dimensions if dim in dims)
+
+    def materialize(self, dims):
+        """Roll up and keep a cuboid for `dims` (from the smallest covering cuboid)"""
+        key = self._key(dims)
+        if key not in self.cuboids:
+            self.cuboids[key] = _rollup(self._source(key), key, self.measures)
+        return self.cuboids[key]
+
+    def _source(self, dims):
+        """Smallest materialized cuboid whose dimensions include all of `dims`"""
+        candidates = [(len(cuboid), key) for key, cuboid in self.cuboids.items()
+                      if set(dims) <= set(key)]
+        if not candidates:
+            raise KeyError(f"No cuboid covers dimensions {dims}")
+        return self.cuboids[min(candidates)[1]]
+
+    def save(self, directory):
+        """Write each cuboid to CSV plus a manifest describing the cube"""
+        os.makedirs(directory, exist_ok=True)
+        files = {}
+        for key, cuboid in self.cuboids.items():
+            name = 'cuboid_' + ('__'.join(key) if key else 'all') + '.csv'
+            cuboid.to_csv(os.path.join(directory, name), index=False)
+            files[name] = list(key)
+        manifest = {'dimensions': self.dimensions, 'measures': self.measures, 'cuboids': files}
+        with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def load(cls, directory):
+        """Load a cube written by save()"""
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        cuboids = {}
+        for name, key in manifest['cuboids'].items():
+            cuboids[tuple(key)] = pd.read_csv(os.path.join(directory, name),
+                                              dtype={dim: str for dim in key})
+        return cls(cuboids, manifest['dimensions'], manifest['measures'])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(self, by=(), measures=None, stats=('mean',), where=None):
+        """
+        Roll up (or drill down) to the dimensions in `by`.
+
+        `where` maps a dimension to a value or list of values to keep. Returns a
+        DataFrame with one row per group and '<measure>_<stat>' columns, where
+        stat is any of count, sum, mean, std, min, max. 'rows' is the number
+        of videos in each group.
+        """
+        by = list(by)
+        measures = list(self.measures if measures is None else measures)
+        where = where or {}
+        source = self._source(set(by) | set(where))
+
+        if where:
+            mask = np.ones(len(source), dtype=bool)
+            for dim, value in where.items():
+                values = value if isinstance(value, (list, tuple, set)) else [value]
+                mask &= source[dim].isin(values).to_numpy()
+            source = source[mask]
+
+        grouped = _rollup(source, by, measures)
+        result = grouped[by + ['rows']].copy()
+        for measure in measures:
+            columns = _stat_columns(measure)
+            n = grouped[columns['count']].astype(float)
+            total = grouped[columns['sum']]
+            for stat in stats:
+                if stat == 'mean':
+                    value = total / n.where(n > 0)
+                elif stat == 'std':
+                    mean = total / n.where(n > 0)
+                    variance = (grouped[columns['sumsq']] - n * mean ** 2) / (n - 1).where(n > 1)
+                    value = np.sqrt(variance.clip(lower=0))
+                elif stat == 'count':
+                    value = grouped[columns['count']]
+                else:
+                    value = grouped[columns[stat]]
+                result[f'{measure}_{stat}'] = value.to_numpy()
+
+        if 'trending_day_of_week' in by:
+            result['trending_day_of_week'] = pd.Categorical(result['trending_day_of_week'],
+                                                            categories=DAY_ORDER, ordered=True)
+            result = result.sort_values(by).reset_index(drop=True)
+        return result
+
+    def series(self, by, measure, stat='mean', where=None):
+        """One measure statistic as a Series indexed by the `by` dimension(s)"""
+        by = [by] if isinstance(by, str) else list(by)
+        result = self.query(by, [measure], (stat,), where)
+        return result.set_index(by if len(by) > 1 else by[0])[f'{measure}_{stat}'].rename(measure)
+
+    def counts(self, by, where=None):
+        """Number of rows (videos) per group"""
+        by = [by] if isinstance(by, str) else list(by)
+        result = self.query(by, measures=[], where=where)
+        return result.set_index(by if len(by) > 1 else by[0])['rows'].rename('count')
@@ -0,0 +1,123 @@
+"""
+Cross-Country Propagation
+Which country a video trends in first, and how long the others take to follow
+
+One sort by (video, first trending date, country) gives each video's
+countries in the order it reached them; dropping repeated (video, country)
+rows leaves the first trending date per country.
+
+The Phase 2 cleaned dataset keeps one row per (video, country) whose
+trending_date is the *latest* trending date, so the analysis uses its
+first_trending_date column (the minimum over the raw rows). Datasets
+without that column fall back to trending_date, which is only correct
+for data that still has every trending row. Every pair of countries within a video
+is then generated with np.repeat offsets inside the sorted array, so the
+pairwise lags cost O(n_first_dates x countries) rather than a join of the
+table against itself.
+"""
+
+import numpy as np
+import pandas as pd
+
+LAG_QUANTILES = (0.5, 0.75, 0.9)
+
+
+def first_trending(df, video_col='video_id', country_col='country', date_col='trending_date',
+                   category_col='category_name'):
+    """
+    First trending date per (video, country), sorted by video then date.
+
+    Adds the video's category (from its earliest row), its first trending
+    date anywhere, lag_days since that date, and order (1 = first country).
+    """
+    columns = [video_col, country_col, date_col] + ([category_col] if category_col in df else [])
+    first = df[columns].assign(**{date_col: pd.to_datetime(df[date_col]).dt.normalize()})
+    first = first.sort_values([video_col, date_col, country_col], kind='mergesort')
+    first = first.drop_duplicates([video_col, country_col]).reset_index(drop=True)
+
+    by_video = first.groupby(video_col, sort=False)
+    if category_col in first:
+        first[category_col] = by_video[category_col].transform('first')
+    first['video_first_date'] = by_video[date_col].transform('first')
+    first['lag_days'] = (first[date_col] - first['video_first_date']).dt.days
+    first['order'] = by_video.cumcount() + 1
+    return first
+
+
+def pairwise_lags(first, video_col='video_id', country_col='country', date_col='trending_date',
+                  category_col='category_name'):
+    """
+    One row per (video, leader country, follower country) with lag_days >= 0.
+
+    The leader is the country that trended earlier (ties broken by country
+    name; same_day marks them). Pairs come from position offsets within each
+    video's block of the sorted first-date table.
+    """
+    video_ids = first[video_col].to_numpy()
+    starts = np.flatnonzero(np.r_[True, video_ids[1:] != video_ids[:-1]])
+    sizes = np.diff(np.r_[starts, len(video_ids)])
+    position = np.arange(len(video_ids)) - np.repeat(starts, sizes)
+    partners = np.repeat(sizes, sizes) - 1 - position
+
+    # Each row pairs with every later row of its video: leader i, follower i + 1 .. block end
+    leader = np.repeat(np.arange(len(video_ids)), partners)
+    block_offsets = np.arange(len(leader)) - np.repeat(np.cumsum(partners) - partners, partners)
+    follower = leader + 1 + block_offsets
+
+    days = first[date_col].to_numpy()
+    lag = ((days[follower] - days[leader]) / np.timedelta64(1, 'D')).astype(np.int64)
+    countries = first[country_col].to_numpy()
+    pairs = pd.DataFrame({
+        video_col: video_ids[leader],
+        'leader': countries[leader],
+        'follower': countries[follower],
+        'lag_days': lag,
+        'same_day': lag == 0,
+    })
+    if category_col in first:
+        pairs.insert(1, category_col, first[category_col].to_numpy()[leader])
+    return pairs
+
+
+def lag_distribution(pairs, by=('leader', 'follower')):
+    """Lag summary per group: videos, same-day share, mean, quantiles and max"""
+    grouped = pairs.groupby(list(by), observed=True)['lag_days']
+    summary = grouped.agg(videos='size', mean_lag='mean', max_lag='max')
+    summary['same_day_share'] = pairs.groupby(list(by), observed=True)['same_day'].mean()
+    quantiles = grouped.quantile(list(LAG_QUANTILES)).unstack()
+    quantiles.columns = [f"p{int(q * 100)}_lag" for q in quantiles.columns]
+    summary = summary.join(quantiles).reset_index()
+    return summary[list(by) + ['videos', 'same_day_share', 'mean_lag'] + list(quantiles.columns) + ['max_lag']]
+
+
+def origin_summary(first, country_col='country', video_col='video_id'):
+    """Per country: videos trending there, videos it led (same-day ties count for each), and lag behind the first country"""
+    led = first['lag_days'] == 0
+    multi = first.groupby(video_col, sort=False)[country_col].transform('size') > 1
+    grouped = first.groupby(country_col)
+    summary = pd.DataFrame({
+        'videos': grouped.size(),
+        'multi_country_videos': multi.groupby(first[country_col]).sum(),
+        'first_country': (led & multi).groupby(first[country_col]).sum(),
+        'median_lag_when_following': first[~led].groupby(country_col)['lag_days'].median(),
+    })
+    summary['first_share'] = summary['first_country'] / summary['multi_country_videos'].replace(0, np.nan)
+    return summary.reset_index().sort_values('first_share', ascending=False)
+
+
+def propagation_analysis(df, category_col='category_name', date_col=None):
+    """
+    Returns (first, pairs, by_pair, by_pair_category, origins): the first-date
+    table, pairwise lags, lag distributions per country pair and per country
+    pair and category, and per-country origin shares.
+
+    date_col defaults to first_trending_date when present, else trending_date.
+    """
+    if date_col is None:
+        date_col = 'first_trending_date' if 'first_trending_date' in df else 'trending_date'
+    first = first_trending(df, date_col=date_col, category_col=category_col)
+    pairs = pairwise_lags(first, date_col=date_col, category_col=category_col)
+    by_pair = lag_distribution(pairs)
+    by_pair_category = lag_distribution(pairs, ('leader', 'follower', category_col)) \
+        if category_col in pairs else pd.DataFrame()
+    return first, pairs, by_pair, by_pair_category, origin_summary(first)
@@ -0,0 +1,362 @@
+"""
+Figure Rendering Pool
+Picklable plot specs rendered concurrently with the Agg backend
+
+Computation code describes each chart as a small dict (chart kind, data,
+options and output path) and adds it to a FigureQueue. Nothing is drawn
+until FigureQueue.render() is called, at which point every queued spec is
+rendered in a process pool, one figure per task.
+
+Each figure is keyed by a hash of its spec (data, options, render profile).
+A .render_cache.json manifest in each output directory records the hash of
+the last render, so figures whose inputs have not changed are skipped.
+"""
+
+import os
+import json
+import time
+import hashlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+import numpy as np
+
+DEFAULT_DPI = 300
+
+# Number of rendering processes (defaults to the number of CPU cores)
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', '0')) or os.cpu_count() or 1
+
+# Render quality profiles: 'draft' for fast iteration, 'publication' for final output
+RENDER_PROFILES = {
+    'draft': {'dpi': 72},
+    'publication': {'dpi': DEFAULT_DPI},
+}
+RENDER_PROFILE = os.getenv('RENDER_PROFILE', 'publication')
+
+# Set RENDER_FORCE=1 to ignore the render cache and redraw every figure
+RENDER_FORCE = os.getenv('RENDER_FORCE', '0') == '1'
+
+# Bump when drawing code changes so cached figures are redrawn
+RENDERER_VERSION = 2
+CACHE_MANIFEST = '.render_cache.json'
+
+
+# ============================================================================
+# SPEC CONSTRUCTION
+# ============================================================================
+
+def plot_spec(kind, data, path=None, **options):
+    """Build a picklable plot spec (chart kind, data and options)"""
+    return {'kind': kind, 'path': str(path) if path is not None else None,
+            'data': data, 'options': options}
+
+
+def panel(kind, data, **options):
+    """Build a sub-plot spec for use inside a 'grid' figure"""
+    return plot_spec(kind, data, **options)
+
+
+def to_list(values):
+    """Convert a Series/array to a plain list so specs stay small and picklable"""
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+# ============================================================================
+# AXIS DRAWERS
+# ============================================================================
+
+def _decorate(ax, opts):
+    """Apply titles, labels, grid and tick options shared by all chart kinds"""
+    if opts.get('title'):
+        ax.set_title(opts['title'], fontsize=opts.get('title_fontsize', 12),
+                     fontweight=opts.get('fontweight', 'normal'))
+    if opts.get('xlabel'):
+        ax.set_xlabel(opts['xlabel'])
+    if opts.get('ylabel'):
+        ax.set_ylabel(opts['ylabel'])
+    if opts.get('xscale'):
+        ax.set_xscale(opts['xscale'])
+    if opts.get('yscale'):
+        ax.set_yscale(opts['yscale'])
+    if opts.get('grid'):
+        ax.grid(True, alpha=0.3, axis=opts.get('grid_axis', 'both'))
+    if opts.get('xtick_rotation') is not None:
+        ax.tick_params(axis='x', rotation=opts['xtick_rotation'])
+    if opts.get('invert_y'):
+        ax.invert_yaxis()
+    if opts.get('legend'):
+        ax.legend()
+
+
+def _draw_barh(ax, data, opts):
+    positions = np.arange(len(data['values']))
+    ax.barh(positions, data['values'])
+    ax.set_yticks(positions)
+    ax.set_yticklabels(data['labels'])
+
+
+def _draw_bar(ax, data, opts):
+    positions = np.arange(len(data['values']))
+    ax.bar(positions, data['values'], color=opts.get('colors'))
+    ax.set_xticks(positions)
+    ax.set_xticklabels(data['labels'])
+
+
+def _draw_lines(ax, data, opts):
+    for series in data['series']:
+        x = series['x'] if 'x' in series else np.arange(len(series['y']))
+        ax.plot(x, series['y'], label=series.get('label'),
+                linewidth=opts.get('linewidth', 2), marker=opts.get('marker', 'o'),
+                markersize=opts.get('markersize', 6))
+
+
+def _draw_scatter(ax, data, opts):
+    ax.scatter(data['x'], data['y'], alpha=opts.get('alpha', 0.5), s=opts.get('s'))
+
+
+def _draw_scatter_binned(ax, data, opts):
+    from matplotlib.colors import LogNorm
+    if not data['n_points']:
+        return
+    counts = np.ma.masked_equal(np.asarray(data['counts']), 0)
+    mesh = ax.pcolormesh(data['x_edges'], data['y_edges'], counts, norm=LogNorm(),
+                         cmap=opts.get('cmap', 'viridis'))
+    ax.figure.colorbar(mesh, ax=ax, label='Videos per bin')
+    if data['outliers_x']:
+        ax.scatter(data['outliers_x'], data['outliers_y'], s=6, color='red', alpha=0.7,
+                   label='Outliers')
+
+
+def _draw_hist(ax, data, opts):
+    for series in data['series']:
+        ax.hist(series['values'], bins=opts.get('bins', 50), alpha=opts.get('alpha', 0.7),
+                label=series.get('label'), edgecolor='black')
+
+
+def _draw_hist_binned(ax, data, opts):
+    """Pre-binned histograms (and optional KDE curves) from the distribution engine"""
+    for series in data['series']:
+        edges = np.asarray(series['edges'])
+        bars = ax.bar(edges[:-1], series['counts'], width=np.diff(edges), align='edge',
+                      alpha=opts.get('alpha', 0.7), label=series.get('label'), edgecolor='black')
+        if series.get('kde'):
+            ax.plot(series['kde']['x'], series['kde']['y'], linewidth=2,
+                    color=bars.patches[0].get_facecolor()[:3] if bars.patches else None)
+
+
+def _draw_bxp(ax, data, opts):
+    """Boxplots from precomputed statistics (Axes.bxp) rather than raw values"""
+    ax.bxp(data['stats'], showmeans=opts.get('showmeans', False))
+
+
+def _draw_boxplot(ax, data, opts):
+    ax.boxplot(data['groups'])
+    if data.get('labels'):
+        ax.set_xticks(np.arange(1, len(data['labels']) + 1))
+        ax.set_xticklabels(data['labels'])
+
+
+def _draw_heatmap(ax, data, opts):
+    import pandas as pd
+    import seaborn as sns
+    matrix = pd.DataFrame(data['values'], index=data['row_labels'], columns=data['col_labels'])
+    sns.heatmap(matrix, ax=ax, annot=opts.get('annot', True), fmt=opts.get('fmt', '.2f'),
+                cmap=opts.get('cmap', 'coolwarm'), center=opts.get('center'),
+                square=opts.get('square', False), linewidths=opts.get('linewidths', 0),
+                cbar_kws=opts.get('cbar_kws', {}))
+
+
+DRAWERS = {
+    'barh': _draw_barh,
+    'bar': _draw_bar,
+    'lines': _draw_lines,
+    'scatter': _draw_scatter,
+    'scatter_binned': _draw_scatter_binned,
+    'hist': _draw_hist,
+    'hist_binned': _draw_hist_binned,
+    'bxp': _draw_bxp,
+    'boxplot': _draw_boxplot,
+    'heatmap': _draw_heatmap,
+}
+
+
+def _draw(ax, spec):
+    DRAWERS[spec['kind']](ax, spec['data'], spec['options'])
+    _decorate(ax, spec['options'])
+
+
+# ============================================================================
+# FIGURE RENDERING (runs inside worker processes)
+# ============================================================================
+
+def render_spec(spec):
+    """Render one figure spec to its output path and return (path, seconds)"""
+    start = time.perf_counter()
+    opts = spec['options']
+
+    if spec['kind'] == 'grid':
+        nrows, ncols = opts['nrows'], opts['ncols']
+        fig = Figure(figsize=opts.get('figsize', (6 * ncols, 6 * nrows)))
+        axes = fig.subplots(nrows, ncols, squeeze=False)
+        for idx, sub_spec in enumerate(spec['data']['panels']):
+            _draw(axes[idx // ncols, idx % ncols], sub_spec)
+        if opts.get('suptitle'):
+            fig.suptitle(opts['suptitle'], fontsize=16, fontweight='bold')
+    else:
+        fig = Figure(figsize=opts.get('figsize', (12, 8)))
+        ax = fig.add_subplot(1, 1, 1)
+        _draw(ax, spec)
+
+    fig.tight_layout()
+    fig.savefig(spec['path'], dpi=opts.get('dpi', DEFAULT_DPI), bbox_inches='tight')
+    return spec['path'], time.perf_counter() - start
+
+
+def _init_worker(style):
+    """Configure the Agg backend and plot style in each rendering process"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    if style:
+        plt.style.use(style)
+    sns.set_palette("husl")
+
+
+def _pool_context():
+    """Fork keeps the calling script from re-running in each worker; fall back to serial without it"""
+    if 'fork' in mp.get_all_start_methods():
+        return mp.get_context('fork')
+    return None
+
+
+# ============================================================================
+# RENDER CACHE
+# ============================================================================
+
+def spec_hash(spec, style=None):
+    """Hash a spec's data, options and style into a stable cache key"""
+    payload = json.dumps({'spec': spec, 'style': style, 'version': RENDERER_VERSION},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _manifest_path(path):
+    return os.path.join(os.path.dirname(path) or '.', CACHE_MANIFEST)
+
+
+def _load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def is_cached(spec, key):
+    """True when the figure exists and was last rendered from the same spec"""
+    manifest = _load_manifest(_manifest_path(spec['path']))
+    return os.path.exists(spec['path']) and manifest.get(os.path.basename(spec['path'])) == key
+
+
+def update_manifests(keys_by_path):
+    """Record the spec hash of each freshly rendered figure in its directory manifest"""
+    by_manifest = {}
+    for path, key in keys_by_path.items():
+        by_manifest.setdefault(_manifest_path(path), {})[os.path.basename(path)] = key
+    for manifest_path, entries in by_manifest.items():
+        manifest = _load_manifest(manifest_path)
+        manifest.update(entries)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+# ============================================================================
+# JOB QUEUE
+# ============================================================================
+
+class FigureQueue:
+    """Collects plot specs during computation and renders them together"""
+
+    def __init__(self, style=None, workers=None, profile=None, force=None):
+        self.style = style
+        self.workers = workers or RENDER_WORKERS
+        self.profile = profile or RENDER_PROFILE
+        if self.profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile '{self.profile}' "
+                             f"(expected one of: {', '.join(RENDER_PROFILES)})")
+        self.force = RENDER_FORCE if force is None else force
+        self.specs = []
+
+    def add(self, kind, path, data, **options):
+        """Queue a single-axis figure"""
+        self.specs.append(plot_spec(kind, data, path=path, **options))
+
+    def add_grid(self, path, panels, nrows, ncols, **options):
+        """Queue a figure made of several sub-plot panels"""
+        self.specs.append(plot_spec('grid', {'panels': panels}, path=path,
+                                    nrows=nrows, ncols=ncols, **options))
+
+    def __len__(self):
+        return len(self.specs)
+
+    def render(self):
+        """Render all queued specs whose inputs changed, concurrently, and clear the queue"""
+        queued, self.specs = self.specs, []
+        if not queued:
+            return []
+
+        start = time.perf_counter()
+        keys = {}
+        specs = []
+        for spec in queued:
+            spec['options'].update(RENDER_PROFILES[self.profile])
+            key = spec_hash(spec, self.style)
+            if self.force or not is_cached(spec, key):
+                keys[spec['path']] = key
+                specs.append(spec)
+
+        skipped = len(queued) - len(specs)
+        if skipped:
+            print(f"✓ Reused {skipped} unchanged figure(s) from the render cache")
+        if not specs:
+            return []
+
+        workers = min(self.workers, len(specs))
+        context = _pool_context()
+        rendered = []
+
+        if workers <= 1 or context is None:
+            workers = 1
+            _init_worker(self.style)
+            for spec in specs:
+                rendered.append(_collect(spec, lambda: render_spec(spec)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(self.style,)) as pool:
+                futures = {pool.submit(render_spec, spec): spec for spec in specs}
+                for future in as_completed(futures):
+                    rendered.append(_collect(futures[future], future.result))
+
+        rendered = [path for path in rendered if path]
+        update_manifests({path: keys[path] for path in rendered})
+        elapsed = time.perf_counter() - start
+        print(f"✓ Rendered {len(rendered)}/{len(specs)} figures with {workers} worker(s) "
+              f"({self.profile} profile) in {elapsed:.2f}s")
+        return rendered
+
+
+def _collect(spec, call):
+    """Run one render call, reporting success or failure like the phase scripts do"""
+    try:
+        path, _ = call()
+        print(f"  ✓ Saved {path}")
+        return path
+    except Exception as e:
+        print(f"  ✗ Failed to render {spec['path']}: {e}")
+        return None
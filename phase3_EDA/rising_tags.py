@@ -0,0 +1,119 @@
+"""
+Rising-Tag Detection
+Vectorized sliding-window growth and z-scores over (tag x day) count matrices
+
+For each country, tag occurrences are counted into a dense (tag x day)
+matrix (tags seen fewer than min_total times are dropped first). Rolling
+window sums for every tag and day come from one cumulative sum along the
+day axis, so growth rates and z-scores for all tags are computed with a
+handful of array operations instead of a loop per tag.
+
+For day t with window W and baseline B:
+- window count:   occurrences on days t-W+1 .. t
+- previous count: occurrences on days t-2W+1 .. t-W
+- growth:         (window + 1) / (previous + 1) - 1
+- z-score:        window count against the mean/std of daily counts over
+                  the B days before the window, scaled to W days
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from tag_frequency import intern_tag_occurrences
+
+
+def _window_sums(cumulative, width, end):
+    """Sum of the `width` days ending at each day index in `end` (columns of a cumsum with a zero column)"""
+    start = np.maximum(end + 1 - width, 0)
+    return cumulative[:, end + 1] - cumulative[:, start]
+
+
+def tag_day_matrix(tag_ids, day_ids, n_tags, n_days, min_total=5):
+    """Dense (kept tags x day) count matrix and the tag IDs of its rows"""
+    counts = sparse.csr_matrix((np.ones(len(tag_ids), dtype=np.float32), (tag_ids, day_ids)),
+                               shape=(n_tags, n_days))
+    totals = np.asarray(counts.sum(axis=1)).ravel()
+    kept = np.flatnonzero(totals >= min_total)
+    return counts[kept].toarray(), kept
+
+
+def rising_scores(counts, window=7, baseline=28):
+    """
+    Window counts, previous-window counts, growth and z-scores for every
+    (tag, day) from day 2 * window - 1 on. Returns a dict of (tags x days)
+    arrays plus the evaluated day indices.
+    """
+    n_days = counts.shape[1]
+    days = np.arange(2 * window - 1, n_days)
+    zero = np.zeros((counts.shape[0], 1), dtype=np.float64)
+    cumulative = np.hstack([zero, np.cumsum(counts, axis=1, dtype=np.float64)])
+    cumulative_sq = np.hstack([zero, np.cumsum(counts.astype(np.float64) ** 2, axis=1)])
+
+    current = _window_sums(cumulative, window, days)
+    previous = _window_sums(cumulative, window, days - window)
+
+    # Baseline: daily counts over the `baseline` days preceding the current window
+    baseline_end = days - window
+    baseline_len = np.minimum(baseline, baseline_end + 1).astype(np.float64)
+    baseline_sum = _window_sums(cumulative, baseline, baseline_end)
+    baseline_sq = _window_sums(cumulative_sq, baseline, baseline_end)
+    mean = baseline_sum / baseline_len
+    variance = np.maximum(baseline_sq / baseline_len - mean ** 2, 0)
+    # Floor the variance at the Poisson rate (and one event per baseline) so quiet tags don't explode
+    variance = np.maximum(variance, np.maximum(mean, 1.0 / baseline_len))
+
+    return {
+        'days': days,
+        'window_count': current,
+        'previous_count': previous,
+        'growth': (current + 1) / (previous + 1) - 1,
+        'zscore': (current - window * mean) / np.sqrt(window * variance),
+    }
+
+
+def rising_tags(df, window=7, baseline=28, min_total=5, min_window_count=3, min_zscore=2.0,
+                top_n=20, tags_col='tags_list', group_col='country', date_col='trending_date'):
+    """
+    Daily list of accelerating tags per group.
+
+    Returns a DataFrame (country, date, rank, tag, window_count,
+    previous_count, growth, zscore) with at most top_n tags per group and day,
+    ranked by z-score, keeping tags with at least min_window_count
+    occurrences in the window and a z-score of at least min_zscore.
+    """
+    row_ids, group_ids, tag_ids, groups, tags = intern_tag_occurrences(df, tags_col, group_col)
+    tags = np.asarray(tags, dtype=object)
+    dates = pd.to_datetime(df[date_col]).dt.normalize()
+    start = dates.min()
+    n_days = int((dates.max() - start).days) + 1
+    row_days = (dates - start).dt.days.to_numpy()
+    day_ids = row_days[row_ids]
+
+    frames = []
+    for g, group in enumerate(groups):
+        in_group = group_ids == g
+        counts, kept = tag_day_matrix(tag_ids[in_group], day_ids[in_group], len(tags), n_days,
+                                      min_total)
+        if len(kept) == 0 or n_days < 2 * window:
+            continue
+        scores = rising_scores(counts, window, baseline)
+        hits = ((scores['window_count'] >= min_window_count) & (scores['zscore'] >= min_zscore))
+        tag_rows, day_cols = np.nonzero(hits)
+        frame = pd.DataFrame({
+            group_col: group,
+            'date': start + pd.to_timedelta(scores['days'][day_cols], unit='D'),
+            'tag': tags[kept[tag_rows]],
+            'window_count': scores['window_count'][tag_rows, day_cols].astype(np.int64),
+            'previous_count': scores['previous_count'][tag_rows, day_cols].astype(np.int64),
+            'growth': scores['growth'][tag_rows, day_cols],
+            'zscore': scores['zscore'][tag_rows, day_cols],
+        })
+        frame = frame.sort_values(['date', 'zscore', 'window_count'], ascending=[True, False, False])
+        frame['rank'] = frame.groupby('date').cumcount() + 1
+        frames.append(frame[frame['rank'] <= top_n])
+
+    columns = [group_col, 'date', 'rank', 'tag', 'window_count', 'previous_count', 'growth', 'zscore']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)[columns]
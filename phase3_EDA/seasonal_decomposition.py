@@ -0,0 +1,187 @@
+"""
+Batch Seasonal Decomposition
+Weekly seasonality and trend for many daily trending-count series at once
+
+Daily trending counts for every series (e.g. country x category, or
+channel) are laid out as one dense (series x day) matrix with a single
+np.bincount. Two decomposition paths work on that matrix:
+
+- classical_decompose(): additive classical decomposition for all rows at
+  once (centered moving-average trend via cumulative sums, per-weekday
+  seasonal means), so the cost is linear in the number of series
+- stl_decompose(): statsmodels STL, which has no batched form, run over
+  row chunks in a process pool
+
+Both return trend, seasonal and residual matrices of the same shape, which
+summarize_components() reduces to per-series trend slope, trend/seasonal
+strength and peak weekday.
+"""
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def series_matrix(df, keys, date_col='trending_date', min_active_days=1):
+    """
+    Dense (series x day) matrix of row counts per key combination and day.
+
+    Returns (matrix, labels, start_date): labels is a DataFrame of key values
+    for each matrix row. Series active on fewer than min_active_days days are
+    dropped.
+    """
+    dates = pd.to_datetime(df[date_col]).dt.normalize()
+    start = dates.min()
+    n_days = int((dates.max() - start).days) + 1
+    day_ids = (dates - start).dt.days.to_numpy()
+
+    series_ids, uniques = pd.MultiIndex.from_frame(df[list(keys)]).factorize()
+    valid = series_ids >= 0
+    flat = series_ids[valid].astype(np.int64) * n_days + day_ids[valid]
+    matrix = np.bincount(flat, minlength=len(uniques) * n_days).reshape(len(uniques), n_days)
+
+    active = (matrix > 0).sum(axis=1) >= min_active_days
+    labels = uniques.to_frame(index=False)[active].reset_index(drop=True)
+    labels.columns = list(keys)
+    return matrix[active].astype(np.float64), labels, start
+
+
+def _centered_moving_average(matrix, period):
+    """Centered moving average along days (2 x period MA for even periods); NaN at the edges"""
+    n_days = matrix.shape[1]
+    cumulative = np.hstack([np.zeros((matrix.shape[0], 1)), np.cumsum(matrix, axis=1)])
+    trend = np.full(matrix.shape, np.nan)
+    if period % 2:
+        half = period // 2
+        if n_days > 2 * half:
+            trend[:, half:n_days - half] = (cumulative[:, period:] - cumulative[:, :-period]) / period
+    else:
+        half = period // 2
+        if n_days > period:
+            ma = (cumulative[:, period:] - cumulative[:, :-period]) / period
+            trend[:, half:n_days - half] = (ma[:, :-1] + ma[:, 1:]) / 2
+    return trend
+
+
+def classical_decompose(matrix, period=7):
+    """
+    Additive classical decomposition of every row at once.
+
+    Returns (trend, seasonal, resid); trend and resid are NaN where the
+    moving average is undefined (the first and last period // 2 days).
+    """
+    trend = _centered_moving_average(matrix, period)
+    detrended = matrix - trend
+    n_days = matrix.shape[1]
+    phase = np.arange(n_days) % period
+    # Mean detrended value per phase (day of the cycle), ignoring undefined edges
+    one_hot = (phase[:, np.newaxis] == np.arange(period)).astype(np.float64)
+    defined = ~np.isnan(detrended)
+    sums = np.where(defined, detrended, 0) @ one_hot
+    counts = defined.astype(np.float64) @ one_hot
+    figure = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    figure -= figure.mean(axis=1, keepdims=True)
+    seasonal = figure[:, phase]
+    return trend, seasonal, matrix - trend - seasonal
+
+
+def _stl_rows(rows, period, robust):
+    from statsmodels.tsa.seasonal import STL
+    trend, seasonal, resid = (np.empty_like(rows) for _ in range(3))
+    for i, row in enumerate(rows):
+        result = STL(row, period=period, robust=robust).fit()
+        trend[i], seasonal[i], resid[i] = result.trend, result.seasonal, result.resid
+    return trend, seasonal, resid
+
+
+def stl_decompose(matrix, period=7, robust=True, workers=None, chunk_size=64):
+    """
+    statsmodels STL for every row, in row chunks across a process pool.
+
+    Falls back to serial execution without the fork start method or with one
+    worker. Returns (trend, seasonal, resid) like classical_decompose().
+    """
+    workers = workers or mp.cpu_count() or 1
+    chunks = [matrix[start:start + chunk_size] for start in range(0, len(matrix), chunk_size)]
+    if not chunks:
+        empty = np.empty_like(matrix)
+        return empty, empty.copy(), empty.copy()
+
+    if workers <= 1 or len(chunks) == 1 or 'fork' not in mp.get_all_start_methods():
+        parts = [_stl_rows(chunk, period, robust) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=mp.get_context('fork')) as pool:
+            parts = list(pool.map(_stl_rows, chunks, [period] * len(chunks), [robust] * len(chunks)))
+    return tuple(np.vstack([part[i] for part in parts]) for i in range(3))
+
+
+def summarize_components(matrix, trend, seasonal, resid, start_date, period=7):
+    """
+    Per-series summary: total and active days, trend slope (videos/day,
+    least squares over the defined trend), trend and seasonal strength
+    (Hyndman's F_T and F_S, 0..1) and the weekday with the largest
+    seasonal effect.
+    """
+    defined = ~np.isnan(trend)
+    days = np.arange(matrix.shape[1], dtype=np.float64)
+
+    # Vectorized least-squares slope of the trend against day index, per row
+    n = defined.sum(axis=1)
+    x = np.where(defined, days, 0)
+    y = np.where(defined, trend, 0)
+    x_mean = x.sum(axis=1) / np.maximum(n, 1)
+    y_mean = y.sum(axis=1) / np.maximum(n, 1)
+    covariance = (np.where(defined, (days - x_mean[:, None]) * (trend - y_mean[:, None]), 0)).sum(axis=1)
+    variance = (np.where(defined, (days - x_mean[:, None]) ** 2, 0)).sum(axis=1)
+    slope = np.divide(covariance, variance, out=np.full(len(matrix), np.nan), where=variance > 0)
+
+    resid_var = np.nanvar(np.where(defined, resid, np.nan), axis=1)
+    trend_strength = 1 - resid_var / np.nanvar(np.where(defined, trend + resid, np.nan), axis=1)
+    seasonal_strength = 1 - resid_var / np.nanvar(np.where(defined, seasonal + resid, np.nan), axis=1)
+
+    # Average seasonal effect per phase (STL's seasonal component drifts over time),
+    # and the weekday of each phase given the weekday of day 0
+    phase = np.arange(matrix.shape[1]) % period
+    one_hot = (phase[:, np.newaxis] == np.arange(period)).astype(np.float64)
+    figure = (seasonal @ one_hot) / one_hot.sum(axis=0)
+    start_weekday = pd.Timestamp(start_date).dayofweek
+    peak_phase = np.argmax(figure, axis=1)
+    peak_weekday = [WEEKDAYS[(start_weekday + p) % 7] for p in peak_phase] if period == 7 else peak_phase
+
+    return pd.DataFrame({
+        'total_videos': matrix.sum(axis=1).astype(np.int64),
+        'active_days': (matrix > 0).sum(axis=1),
+        'trend_slope': slope,
+        'trend_strength': np.clip(trend_strength, 0, 1),
+        'seasonal_strength': np.clip(seasonal_strength, 0, 1),
+        'peak_weekday': peak_weekday,
+        'weekly_amplitude': figure.max(axis=1) - figure.min(axis=1),
+    })
+
+
+def decompose_groups(df, keys, method='classical', period=7, min_active_days=14, workers=None,
+                     date_col='trending_date'):
+    """
+    Decompose daily trending counts for every key combination with enough history.
+
+    method='classical' runs the vectorized decomposition; method='stl' runs
+    statsmodels STL in a process pool. Returns (summary, components) where
+    summary has one row per series and components holds the matrices.
+    """
+    matrix, labels, start = series_matrix(df, keys, date_col, min_active_days)
+    if len(matrix) == 0 or matrix.shape[1] < 2 * period:
+        return labels.iloc[:0].assign(total_videos=pd.Series(dtype=float)), None
+    if method == 'stl':
+        trend, seasonal, resid = stl_decompose(matrix, period, workers=workers)
+    else:
+        trend, seasonal, resid = classical_decompose(matrix, period)
+    summary = pd.concat([labels, summarize_components(matrix, trend, seasonal, resid, start, period)],
+                        axis=1)
+    components = {'observed': matrix, 'trend': trend, 'seasonal': seasonal, 'resid': resid,
+                  'start_date': start, 'labels': labels}
+    return summary, components
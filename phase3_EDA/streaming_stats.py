@@ -0,0 +1,322 @@
+"""
+Mergeable Streaming Summary Statistics
+Per-partition accumulators for out-of-core EDA
+
+Each accumulator can be updated chunk by chunk and merged with another
+accumulator built over a different partition:
+
+- MomentAccumulator: count, mean, variance (Welford/Chan), min, max
+- QuantileSketch: log-bucketed sketch with bounded relative error
+- HeavyHitters: Space-Saving counters with per-item error bounds (mode)
+
+summary_statistics_from_csv() streams a CSV in chunks, summarizes chunks in
+a process pool and merges the partial results, so the full dataset is never
+held in memory.
+"""
+
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ['US', 'GB', 'CA', 'IN']
+OVERALL = 'All'
+
+
+class MomentAccumulator:
+    """Count, mean, M2 (sum of squared deviations), min and max"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Fold a batch of values in, using vectorized batch moments"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        batch = MomentAccumulator()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        return self.merge(batch)
+
+    def merge(self, other):
+        """Combine with another accumulator (Chan et al. parallel update)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def std(self, ddof=1):
+        if self.count - ddof <= 0:
+            return np.nan
+        return math.sqrt(self.m2 / (self.count - ddof))
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch-style).
+
+    Every quantile estimate is within relative_accuracy of a true value at
+    that rank. Bucket counts are plain dicts, so sketches merge by addition.
+    """
+
+    def __init__(self, relative_accuracy=0.005):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_buckets(self, store, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+        uniq, counts = np.unique(keys, return_counts=True)
+        for key, n in zip(uniq.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + n
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+        self.zero_count += int((values == 0).sum())
+        self.count += len(values)
+        return self
+
+    def merge(self, other):
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in other_store.items():
+                store[key] = store.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _bucket_value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Approximate value at quantile q (0 <= q <= 1)"""
+        if self.count == 0:
+            return np.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive))
+
+
+class HeavyHitters:
+    """
+    Space-Saving heavy-hitter counters, mergeable across partitions.
+
+    Keeps at most `capacity` items. Each kept item has an estimated count and
+    an error bound (estimate - error <= true count <= estimate). `floor` is
+    the largest count any unmonitored item could have.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.floor = 0
+        self.total = 0
+
+    @classmethod
+    def from_counts(cls, counts, capacity=100):
+        """Build a summary from exact counts (a dict or value_counts Series)"""
+        summary = cls(capacity)
+        items = counts.items() if hasattr(counts, 'items') else counts
+        summary.counts = {key: int(n) for key, n in items}
+        summary.errors = {key: 0 for key in summary.counts}
+        summary.total = sum(summary.counts.values())
+        summary._truncate()
+        return summary
+
+    def update(self, values):
+        """Count a batch of values (NaN ignored) and fold the batch into the summary"""
+        values = pd.Series(values).dropna()
+        if len(values) == 0:
+            return self
+        return self.merge(HeavyHitters.from_counts(values.value_counts(sort=False), self.capacity))
+
+    def merge(self, other):
+        keys = set(self.counts) | set(other.counts)
+        counts, errors = {}, {}
+        for key in keys:
+            counts[key] = self.counts.get(key, self.floor) + other.counts.get(key, other.floor)
+            errors[key] = self.errors.get(key, self.floor) + other.errors.get(key, other.floor)
+        self.counts, self.errors = counts, errors
+        self.floor += other.floor
+        self.total += other.total
+        self._truncate()
+        return self
+
+    def _truncate(self):
+        if len(self.counts) <= self.capacity:
+            return
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        dropped = ranked[self.capacity:]
+        self.floor = max(self.floor, dropped[0][1])
+        self.counts = dict(ranked[:self.capacity])
+        self.errors = {key: self.errors[key] for key in self.counts}
+
+    def to_dict(self):
+        """JSON-serializable state (items become [item, count, error] triples)"""
+        return {'capacity': self.capacity, 'floor': self.floor, 'total': self.total,
+                'items': [[key, n, self.errors[key]] for key, n in self.counts.items()]}
+
+    @classmethod
+    def from_dict(cls, state):
+        summary = cls(state['capacity'])
+        summary.floor = state['floor']
+        summary.total = state['total']
+        summary.counts = {key: n for key, n, _ in state['items']}
+        summary.errors = {key: error for key, _, error in state['items']}
+        return summary
+
+    def top_k(self, k=10):
+        """[(item, estimated_count, error_bound)] for the k most frequent items"""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], str(item[0])))
+        return [(key, n, self.errors[key]) for key, n in ranked[:k]]
+
+    def mode(self):
+        """
+        Most frequent value by guaranteed count (estimate - error), smallest
+        value on ties like pandas. Exact while the number of distinct values
+        stays within capacity.
+        """
+        if not self.counts:
+            return np.nan
+        guaranteed = {key: n - self.errors[key] for key, n in self.counts.items()}
+        best = max(guaranteed.values())
+        return min(key for key, n in guaranteed.items() if n == best)
+
+
+class MetricSummary:
+    """All accumulators needed for one (metric, country) row of the summary table"""
+
+    def __init__(self, relative_accuracy=0.005, mode_capacity=1000):
+        self.moments = MomentAccumulator()
+        self.quantiles = QuantileSketch(relative_accuracy)
+        self.heavy_hitters = HeavyHitters(mode_capacity)
+
+    def update(self, values):
+        self.moments.update(values)
+        self.quantiles.update(values)
+        self.heavy_hitters.update(values)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def row(self):
+        return {
+            'mean': self.moments.mean if self.moments.count else np.nan,
+            'median': self.quantiles.quantile(0.5),
+            'mode': self.heavy_hitters.mode(),
+            'std': self.moments.std(),
+            'min': self.moments.min if self.moments.count else np.nan,
+            'max': self.moments.max if self.moments.count else np.nan,
+            'q25': self.quantiles.quantile(0.25),
+            'q75': self.quantiles.quantile(0.75),
+        }
+
+
+def summarize_chunk(chunk, metrics, group_col='country'):
+    """Summaries keyed by (metric, group) for one partition, including the overall group"""
+    summaries = {}
+    for metric in metrics:
+        summaries[(metric, OVERALL)] = MetricSummary().update(chunk[metric].to_numpy())
+        for group, values in chunk.groupby(group_col)[metric]:
+            summaries[(metric, group)] = MetricSummary().update(values.to_numpy())
+    return summaries
+
+
+def merge_summaries(target, partial):
+    """Merge one partition's summaries into the running totals"""
+    for key, summary in partial.items():
+        if key in target:
+            target[key].merge(summary)
+        else:
+            target[key] = summary
+    return target
+
+
+def summary_table(summaries, metrics, groups=None):
+    """Render merged summaries as the phase3_summary_statistics.csv layout"""
+    groups = groups or [OVERALL] + COUNTRIES
+    rows = []
+    for group in groups:
+        for metric in metrics:
+            if (metric, group) in summaries:
+                rows.append({'metric': metric, 'country': group, **summaries[(metric, group)].row()})
+    return pd.DataFrame(rows)
+
+
+def summary_statistics_from_chunks(chunks, metrics, group_col='country', workers=None):
+    """
+    Summarize an iterable of DataFrame partitions in parallel and merge the results.
+
+    At most 2 x workers partitions are in flight at a time, so memory stays
+    bounded by the chunk size rather than the dataset size.
+    """
+    workers = workers or mp.cpu_count() or 1
+    merged = {}
+    if workers <= 1 or 'fork' not in mp.get_all_start_methods():
+        for chunk in chunks:
+            merge_summaries(merged, summarize_chunk(chunk, metrics, group_col))
+        return merged
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('fork')) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(summarize_chunk, chunk, metrics, group_col))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge_summaries(merged, future.result())
+        for future in pending:
+            merge_summaries(merged, future.result())
+    return merged
+
+
+def summary_statistics_from_csv(path, metrics, group_col='country', chunksize=100_000, workers=None):
+    """Stream a CSV in chunks and return the merged summary statistics table"""
+    chunks = pd.read_csv(path, usecols=[group_col] + list(metrics), chunksize=chunksize)
+    summaries = summary_statistics_from_chunks(chunks, metrics, group_col, workers)
+    return summary_table(summaries, metrics)
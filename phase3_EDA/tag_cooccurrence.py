@@ -0,0 +1,118 @@
+"""
+Tag Co-occurrence and Association Metrics
+Sparse video x tag incidence matrices and tag x tag co-occurrence counts
+
+Each video's tags become one row of a binary CSR incidence matrix X, so
+X.T @ X gives the number of videos every pair of tags shares in a single
+sparse product. Tags below a minimum support are dropped before the product
+to keep the co-occurrence matrix small. PMI, lift and Jaccard for the top
+pairs follow from the pair counts and the per-tag supports.
+
+Videos are counted once per group (a video trending on several days, or in
+several countries for the overall group, is one row).
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from tag_frequency import intern_tag_occurrences
+
+
+def incidence_matrix(row_ids, tag_ids, n_rows, n_tags):
+    """Binary CSR matrix with a 1 wherever a row (video) carries a tag"""
+    X = sparse.csr_matrix((np.ones(len(row_ids), dtype=np.int32), (row_ids, tag_ids)),
+                          shape=(n_rows, n_tags))
+    X.sum_duplicates()
+    X.data[:] = 1
+    return X
+
+
+def cooccurrence_matrix(X, min_support=5):
+    """
+    Tag x tag co-occurrence counts for tags carried by at least min_support rows.
+
+    Returns (C, support, tag_index): C is a symmetric CSR matrix whose diagonal
+    is each tag's support, and tag_index maps C's rows back to X's columns.
+    """
+    support = np.asarray(X.sum(axis=0)).ravel()
+    tag_index = np.flatnonzero(support >= min_support)
+    X_kept = X[:, tag_index]
+    C = (X_kept.T @ X_kept).tocsr()
+    return C, support[tag_index], tag_index
+
+
+def association_pairs(C, support, n_rows, labels, min_count=3, top_k=500):
+    """
+    Top tag pairs by co-occurrence count with PMI, lift and Jaccard.
+
+    PMI is log2(P(a, b) / (P(a) P(b))), lift is the ratio inside the log and
+    Jaccard is |a and b| / |a or b|, all over the n_rows videos of the group.
+    """
+    upper = sparse.triu(C, k=1).tocoo()
+    mask = upper.data >= min_count
+    a, b, count = upper.row[mask], upper.col[mask], upper.data[mask].astype(np.int64)
+    if len(count) > top_k:
+        top = np.argpartition(-count, top_k - 1)[:top_k]
+        a, b, count = a[top], b[top], count[top]
+
+    support_a = support[a].astype(np.int64)
+    support_b = support[b].astype(np.int64)
+    lift = count * n_rows / (support_a * support_b)
+    pairs = pd.DataFrame({
+        'tag_a': labels[a],
+        'tag_b': labels[b],
+        'cooccurrence': count,
+        'support_a': support_a,
+        'support_b': support_b,
+        'pmi': np.log2(lift),
+        'lift': lift,
+        'jaccard': count / (support_a + support_b - count),
+    })
+    return pairs.sort_values(['cooccurrence', 'lift'], ascending=False).reset_index(drop=True)
+
+
+def tag_associations(df, tags_col='tags_list', group_col='country', video_col='video_id',
+                     min_support=5, min_count=3, top_k=500, overall_label='All'):
+    """
+    Co-occurrence matrices and top association pairs overall and per group.
+
+    Returns (pairs, matrices): pairs maps overall_label and each group to a
+    DataFrame from association_pairs(); matrices maps the same keys to
+    (C, labels) for persistence.
+    """
+    videos = df.drop_duplicates([video_col, group_col]).reset_index(drop=True)
+    row_ids, group_ids, tag_ids, groups, tags = intern_tag_occurrences(videos, tags_col, group_col)
+    tags = np.asarray(tags, dtype=object)
+    n_tags = len(tags)
+
+    # Overall: one row per distinct video, whichever countries it trended in
+    video_codes, video_labels = pd.factorize(videos[video_col])
+    jobs = [(overall_label, video_codes[row_ids], tag_ids, len(video_labels))]
+    videos_per_group = np.bincount(pd.factorize(videos[group_col])[0], minlength=len(groups))
+    for g, group in enumerate(groups):
+        in_group = group_ids == g
+        jobs.append((group, row_ids[in_group], tag_ids[in_group], int(videos_per_group[g])))
+
+    pairs, matrices = {}, {}
+    for label, rows, ids, n_videos in jobs:
+        X = incidence_matrix(rows, ids, len(videos), n_tags)
+        C, support, tag_index = cooccurrence_matrix(X, min_support)
+        pairs[label] = association_pairs(C, support, n_videos, tags[tag_index], min_count, top_k)
+        matrices[label] = (C, tags[tag_index])
+    return pairs, matrices
+
+
+def save_associations(pairs, matrices, directory):
+    """Write all pairs to pairs.csv and each group's co-occurrence matrix to .npz + tag list"""
+    os.makedirs(directory, exist_ok=True)
+    frames = [frame.assign(group=label) for label, frame in pairs.items()]
+    pd.concat(frames, ignore_index=True)[['group'] + list(frames[0].columns)].to_csv(
+        os.path.join(directory, 'pairs.csv'), index=False)
+    for label, (C, labels) in matrices.items():
+        sparse.save_npz(os.path.join(directory, f'cooccurrence_{label}.npz'), C)
+        with open(os.path.join(directory, f'tags_{label}.json'), 'w', encoding='utf-8') as f:
+            json.dump(labels.tolist(), f, ensure_ascii=False)
@@ -0,0 +1,89 @@
+"""
+Tag Frequency Engine
+One-pass tag counts for every group (e.g. country) at once
+
+Tag lists are exploded into parallel arrays of interned tag IDs and group
+IDs, counted with a single np.bincount over the combined (group, tag) key,
+and reduced to top-k per group with np.argpartition. Once tags are
+interned, counting 10M tag occurrences takes a fraction of a second.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+
+def intern_tag_occurrences(df, tags_col='tags_list', group_col='country'):
+    """
+    Explode tag lists into parallel (row, group_id, tag_id) arrays.
+
+    Returns (row_ids, group_ids, tag_ids, groups, tags): row_ids are positions
+    in df, and groups and tags are the label arrays the IDs index into. Tag
+    IDs follow first-occurrence order.
+    """
+    tag_lists = [tags if isinstance(tags, list) else [] for tags in df[tags_col]]
+    lengths = np.fromiter((len(tags) for tags in tag_lists), dtype=np.int64, count=len(tag_lists))
+    flat_tags = np.fromiter(itertools.chain.from_iterable(tag_lists), dtype=object,
+                            count=int(lengths.sum()))
+
+    row_ids = np.repeat(np.arange(len(tag_lists), dtype=np.int64), lengths)
+    row_group_ids, groups = pd.factorize(df[group_col])
+    group_ids = np.repeat(row_group_ids.astype(np.int64), lengths)
+
+    keep = flat_tags != ''
+    tag_ids, tags = pd.factorize(flat_tags[keep])
+    return row_ids[keep], group_ids[keep], tag_ids.astype(np.int64), groups, tags
+
+
+def intern_tags(df, tags_col='tags_list', group_col='country'):
+    """
+    Explode tag lists into (group_id, tag_id) arrays.
+
+    Returns (group_ids, tag_ids, groups, tags) where groups and tags are the
+    label arrays the IDs index into. Tag IDs follow first-occurrence order.
+    """
+    _, group_ids, tag_ids, groups, tags = intern_tag_occurrences(df, tags_col, group_col)
+    return group_ids, tag_ids, groups, tags
+
+
+def count_matrix(group_ids, tag_ids, n_groups, n_tags):
+    """Count occurrences of every (group, tag) pair into an n_groups x n_tags matrix"""
+    flat = group_ids * n_tags + tag_ids
+    return np.bincount(flat, minlength=n_groups * n_tags).reshape(n_groups, n_tags)
+
+
+def top_k_indices(counts, k):
+    """Indices of the k largest counts, ordered by count desc then by index (first seen)"""
+    k = min(k, len(counts))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-counts, k - 1)[:k]
+    order = np.lexsort((candidates, -counts[candidates]))
+    return candidates[order]
+
+
+def tag_frequencies(df, top_k=20, tags_col='tags_list', group_col='country', overall_label='All'):
+    """
+    Top-k tag counts overall and per group, computed in one pass.
+
+    Returns a dict mapping overall_label and each group value to a DataFrame
+    with 'tag' and 'count' columns, most frequent first.
+    """
+    group_ids, tag_ids, groups, tags = intern_tags(df, tags_col, group_col)
+    results = {overall_label: pd.DataFrame({'tag': [], 'count': []})}
+    if len(tag_ids) == 0:
+        return results
+
+    counts = count_matrix(group_ids, tag_ids, len(groups), len(tags))
+    tags = np.asarray(tags, dtype=object)
+
+    def top_frame(row):
+        idx = top_k_indices(row, top_k)
+        idx = idx[row[idx] > 0]
+        return pd.DataFrame({'tag': tags[idx], 'count': row[idx]})
+
+    results[overall_label] = top_frame(counts.sum(axis=0))
+    for g, group in enumerate(groups):
+        results[group] = top_frame(counts[g])
+    return results
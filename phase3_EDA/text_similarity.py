@@ -0,0 +1,197 @@
+"""
+TF-IDF Similar-Video Search
+Sparse TF-IDF index over video titles and descriptions
+
+Each distinct video becomes one L2-normalized row of a CSR TF-IDF matrix,
+so cosine similarity is a sparse dot product. Single lookups multiply one
+row against the whole matrix; the all-pairs kNN graph processes query rows
+in chunks sized so each dense score block stays under MAX_BLOCK_CELLS.
+Only NumPy, pandas and scipy.sparse are used.
+"""
+
+import os
+import re
+import json
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Upper bound on (query rows x indexed videos) scores held densely at once
+MAX_BLOCK_CELLS = 20_000_000
+
+TOKEN_PATTERN = re.compile(r'\w\w+', re.UNICODE)
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have how i in is it its of on or our that the this to
+was we what when who why will with you your my me new video videos official full http https
+www com youtube watch subscribe channel
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens of two or more characters, minus stop words and pure numbers"""
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in STOP_WORDS and not token.isdigit()]
+
+
+def _l2_normalize(X):
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ X
+
+
+def _top_k_rows(scores, k):
+    """Column indices and values of the k largest entries in each row of a dense block"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return (np.take_along_axis(candidates, order, axis=1),
+            np.take_along_axis(candidate_scores, order, axis=1))
+
+
+class TfidfIndex:
+    """L2-normalized TF-IDF rows for a set of videos, with top-k cosine search"""
+
+    def __init__(self, matrix, idf, vocabulary, video_ids, titles=None):
+        self.matrix = matrix.tocsr()
+        self.idf = idf
+        self.vocabulary = vocabulary
+        self.term_index = {term: i for i, term in enumerate(vocabulary)}
+        self.video_ids = np.asarray(video_ids, dtype=object)
+        self.row_index = {video_id: i for i, video_id in enumerate(self.video_ids)}
+        self.titles = None if titles is None else np.asarray(titles, dtype=object)
+
+    @classmethod
+    def build(cls, df, text_cols=('title', 'description'), video_col='video_id',
+              min_df=2, max_df=0.5):
+        """
+        Index one document per distinct video: its text columns joined together.
+
+        Terms in fewer than min_df documents, or in more than max_df of them,
+        are dropped. Term frequencies are sublinear (1 + log tf) and idf is
+        smoothed: log((1 + N) / (1 + df)) + 1.
+        """
+        videos = df.drop_duplicates(video_col).reset_index(drop=True)
+        text = videos[list(text_cols)].fillna('').astype(str).agg(' '.join, axis=1)
+        token_lists = [tokenize(doc) for doc in text]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64,
+                              count=len(token_lists))
+        flat_tokens = np.fromiter(itertools.chain.from_iterable(token_lists), dtype=object,
+                                  count=int(lengths.sum()))
+        doc_ids = np.repeat(np.arange(len(token_lists)), lengths)
+        term_ids, vocabulary = pd.factorize(flat_tokens)
+
+        n_docs, n_terms = len(token_lists), len(vocabulary)
+        counts = sparse.csr_matrix((np.ones(len(term_ids), dtype=np.float64), (doc_ids, term_ids)),
+                                   shape=(n_docs, n_terms))
+        counts.sum_duplicates()
+
+        document_frequency = np.bincount(counts.indices, minlength=n_terms)
+        keep = np.flatnonzero((document_frequency >= min_df) &
+                              (document_frequency <= max_df * n_docs))
+        counts = counts[:, keep]
+        document_frequency = document_frequency[keep]
+        vocabulary = np.asarray(vocabulary, dtype=object)[keep]
+
+        idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+        counts.data = 1 + np.log(counts.data)
+        matrix = _l2_normalize(counts @ sparse.diags(idf))
+        return cls(matrix, idf, vocabulary.tolist(), videos[video_col].to_numpy(),
+                   videos['title'].to_numpy() if 'title' in videos else None)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def vectorize(self, text):
+        """TF-IDF row (1 x n_terms CSR) for free text, using the index vocabulary and idf"""
+        term_ids = [self.term_index[token] for token in tokenize(text) if token in self.term_index]
+        if not term_ids:
+            return sparse.csr_matrix((1, len(self.vocabulary)))
+        terms, tf = np.unique(term_ids, return_counts=True)
+        weights = (1 + np.log(tf)) * self.idf[terms]
+        row = sparse.csr_matrix((weights, (np.zeros(len(terms), dtype=np.int64), terms)),
+                                shape=(1, len(self.vocabulary)))
+        return _l2_normalize(row)
+
+    def _results(self, rows, scores):
+        results = pd.DataFrame({'video_id': self.video_ids[rows], 'score': scores})
+        if self.titles is not None:
+            results['title'] = self.titles[rows]
+        return results
+
+    def similar(self, video_id, k=10):
+        """Top-k most similar videos to an indexed video (excluding itself)"""
+        row = self.row_index[video_id]
+        scores = (self.matrix @ self.matrix[row].T).toarray().ravel()
+        scores[row] = -np.inf
+        rows, top_scores = _top_k_rows(scores[np.newaxis, :], k)
+        return self._results(rows[0], top_scores[0])
+
+    def search(self, text, k=10):
+        """Top-k videos most similar to free text"""
+        scores = (self.matrix @ self.vectorize(text).T).toarray().ravel()
+        rows, top_scores = _top_k_rows(scores[np.newaxis, :], k)
+        return self._results(rows[0], top_scores[0])
+
+    def knn(self, k=10, rows=None, chunk_size=None):
+        """
+        Top-k neighbours for many indexed videos at once.
+
+        Query rows are processed in chunks; each chunk is one sparse product
+        against the whole index, densified to a (chunk x n) block. Returns
+        (neighbors, scores), both (len(rows) x k) arrays of row positions and
+        cosine similarities.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        k = min(k, len(self) - 1)
+        chunk_size = chunk_size or max(1, MAX_BLOCK_CELLS // max(len(self), 1))
+        matrix_t = self.matrix.T.tocsc()
+        neighbors = np.empty((len(rows), k), dtype=np.int64)
+        scores = np.empty((len(rows), k))
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            block = (self.matrix[chunk] @ matrix_t).toarray()
+            block[np.arange(len(chunk)), chunk] = -np.inf
+            neighbors[start:start + len(chunk)], scores[start:start + len(chunk)] = _top_k_rows(block, k)
+        return neighbors, scores
+
+    def knn_table(self, k=10, chunk_size=None):
+        """kNN graph as an edge list: video_id, neighbor_id, rank, score"""
+        neighbors, scores = self.knn(k, chunk_size=chunk_size)
+        n, k = neighbors.shape
+        return pd.DataFrame({
+            'video_id': np.repeat(self.video_ids, k),
+            'neighbor_id': self.video_ids[neighbors.ravel()],
+            'rank': np.tile(np.arange(1, k + 1), n),
+            'score': scores.ravel(),
+        })
+
+    def save(self, directory):
+        """Write the TF-IDF matrix (.npz), idf and vocabulary, and the row -> video mapping"""
+        os.makedirs(directory, exist_ok=True)
+        sparse.save_npz(os.path.join(directory, 'tfidf.npz'), self.matrix)
+        np.save(os.path.join(directory, 'idf.npy'), self.idf)
+        with open(os.path.join(directory, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.vocabulary, f, ensure_ascii=False)
+        videos = pd.DataFrame({'video_id': self.video_ids})
+        if self.titles is not None:
+            videos['title'] = self.titles
+        videos.to_csv(os.path.join(directory, 'videos.csv'), index=False)
+
+    @classmethod
+    def load(cls, directory):
+        """Load an index written by save()"""
+        matrix = sparse.load_npz(os.path.join(directory, 'tfidf.npz'))
+        idf = np.load(os.path.join(directory, 'idf.npy'))
+        with open(os.path.join(directory, 'vocabulary.json'), 'r', encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        videos = pd.read_csv(os.path.join(directory, 'videos.csv'), dtype={'video_id': str})
+        titles = videos['title'].to_numpy() if 'title' in videos else None
+        return cls(matrix, idf, vocabulary, videos['video_id'].to_numpy(), titles)
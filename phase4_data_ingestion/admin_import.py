@@ -0,0 +1,119 @@
+"""
+Phase 4 Bulk Import Files
+Node and relationship CSVs in the header format expected by `neo4j-admin database import`
+
+For an initial load, the offline importer writes the store files directly
+and is far faster than transactional Cypher. The files are built from the
+cleaned dataset with the same rows as the Cypher ingestion (graph_data.py).
+MERGE semantics are reproduced by deduplicating: the last snapshot of a
+video wins, and every relationship is written once.
+
+Usage (after Phase 2):
+    python admin_import.py [output_dir]
+    ./neo4j_admin_import.sh [output_dir] [database]
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+from graph_data import (DAYS, RELATIONSHIPS, load_cleaned_dataset, cleaned_tags, country_rows, category_rows,
+                        channel_rows, video_rows, relationship_rows)
+
+ADMIN_IMPORT_DIR = os.getenv('ADMIN_IMPORT_DIR', 'phase4_import')
+
+# Label / relationship type -> file name
+NODE_FILES = {
+    'Video': 'videos.csv',
+    'Channel': 'channels.csv',
+    'Category': 'categories.csv',
+    'Country': 'countries.csv',
+    'Tag': 'tags.csv',
+    'Day': 'days.csv',
+}
+RELATIONSHIP_FILES = {
+    'VIDEO_BELONGS_TO_CATEGORY': 'video_belongs_to_category.csv',
+    'VIDEO_PUBLISHED_BY_CHANNEL': 'video_published_by_channel.csv',
+    'CHANNEL_HAS_VIDEO': 'channel_has_video.csv',
+    'VIDEO_TRENDING_IN_COUNTRY': 'video_trending_in_country.csv',
+    'VIDEO_TRENDING_ON': 'video_trending_on.csv',
+    'VIDEO_HAS_TAG': 'video_has_tag.csv',
+}
+
+# Video properties and their import types (untyped columns are strings)
+VIDEO_PROPERTIES = {
+    'video_id': None,
+    'title': None,
+    'views': 'long',
+    'likes': 'double',
+    'dislikes': 'double',
+    'comment_count': 'long',
+    'engagement_ratio': 'double',
+    'like_dislike_ratio': 'double',
+    'trending_date': None,
+    'publish_time': None,
+    'days_to_trend': 'long',
+    'country_code': None,
+}
+
+
+def _header(name, kind):
+    return f"{name}:{kind}" if kind else name
+
+
+def _write(frame, directory, file_name, header):
+    path = os.path.join(directory, file_name)
+    frame.to_csv(path, index=False, header=header, encoding='utf-8')
+    return len(frame)
+
+
+def write_import_files(df, directory=ADMIN_IMPORT_DIR):
+    """
+    Write the node and relationship CSVs for the cleaned dataset into
+    directory. Returns {label or type: rows written}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    videos = video_rows(df)
+    counts = {}
+
+    # Last snapshot of each video wins, as with MERGE + SET
+    nodes = videos.drop_duplicates('video_unique_id', keep='last')
+    counts['Video'] = _write(
+        nodes[['video_unique_id'] + list(VIDEO_PROPERTIES)], directory, NODE_FILES['Video'],
+        ['video_unique_id:ID(Video)'] + [_header('country' if name == 'country_code' else name, kind)
+                                         for name, kind in VIDEO_PROPERTIES.items()])
+    counts['Channel'] = _write(channel_rows(df), directory, NODE_FILES['Channel'],
+                               ['channel_title:ID(Channel)', 'total_views:long', 'avg_engagement_ratio:double',
+                                'video_count:long'])
+    # ID columns are stored as strings, so the integer key is repeated as a typed property
+    categories = category_rows(df).drop_duplicates('category_id')
+    counts['Category'] = _write(categories[['category_id', 'category_id', 'category_name']], directory,
+                                NODE_FILES['Category'], [':ID(Category)', 'category_id:long', 'category_name'])
+    counts['Country'] = _write(country_rows(df), directory, NODE_FILES['Country'],
+                               ['country_code:ID(Country)', 'country_name'])
+    tags = pd.DataFrame({'tag_name': cleaned_tags(df).unique()})
+    counts['Tag'] = _write(tags, directory, NODE_FILES['Tag'], ['tag_name:ID(Tag)'])
+    counts['Day'] = _write(pd.DataFrame({'day_name': DAYS}), directory, NODE_FILES['Day'], ['day_name:ID(Day)'])
+
+    for rel_type, pairs in relationship_rows(df, videos).items():
+        (start_label, _), (end_label, _) = RELATIONSHIPS[rel_type]
+        counts[rel_type] = _write(pairs, directory, RELATIONSHIP_FILES[rel_type],
+                                  [f':START_ID({start_label})', f':END_ID({end_label})'])
+    return counts
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else ADMIN_IMPORT_DIR
+    print("=" * 80)
+    print("PHASE 4: NEO4J-ADMIN IMPORT FILES")
+    print("=" * 80)
+    try:
+        cleaned = load_cleaned_dataset('youtube_trending_cleaned.csv')
+    except FileNotFoundError:
+        print("✗ Error: youtube_trending_cleaned.csv not found. Please run Phase 2 first.")
+        exit(1)
+    for name, rows in write_import_files(cleaned, directory).items():
+        print(f"  {name}: {rows:,} rows")
+    print(f"✓ Wrote import files to {directory}/")
+    print("  Next: ./neo4j_admin_import.sh " + directory + " <database>")
@@ -0,0 +1,95 @@
+"""
+Phase 4 Ingestion Checkpoint
+Resume an interrupted load from the last committed batch
+
+A small JSON file records a fingerprint of the cleaned dataset, the batch
+size, the ingestion mode and the batches (sequential mode) or write stages
+(parallel mode) that have committed. Progress only advances over batches
+or stages that wrote every row, so anything that failed is redone on the
+next run. On restart the checkpoint is only trusted when the fingerprint,
+batch size and mode still match, since batch boundaries and progress
+records depend on all three; otherwise ingestion starts from the first
+batch. Every write MERGEs, so redoing a batch is safe.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+CHECKPOINT_FILE = os.getenv('INGESTION_CHECKPOINT', 'phase4_checkpoint.json')
+
+
+def dataset_fingerprint(path, chunk_size=1 << 20):
+    """SHA-1 of the dataset file contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionCheckpoint:
+    """Committed progress of one dataset load, saved after every batch"""
+
+    def __init__(self, fingerprint, batch_size, mode, path=CHECKPOINT_FILE):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.batch_size = batch_size
+        self.mode = mode
+        self.last_batch = -1
+        self.completed_stages = []
+        self.complete = False
+        self.status = 'new'
+
+    @classmethod
+    def load(cls, fingerprint, batch_size, mode, path=CHECKPOINT_FILE):
+        """
+        Checkpoint for this dataset, batch size and mode ('sequential' or
+        'parallel'). status is 'resumed' when a matching checkpoint was found,
+        'new' when there was none, and 'mismatch' when the file belonged to
+        another dataset, batch size or mode.
+        """
+        checkpoint = cls(fingerprint, batch_size, mode, path)
+        if not os.path.exists(path):
+            return checkpoint
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if (saved.get('fingerprint'), saved.get('batch_size'), saved.get('mode')) != (fingerprint, batch_size, mode):
+            checkpoint.status = 'mismatch'
+            return checkpoint
+        checkpoint.last_batch = saved.get('last_batch', -1)
+        checkpoint.completed_stages = saved.get('completed_stages', [])
+        checkpoint.complete = saved.get('complete', False)
+        checkpoint.status = 'resumed'
+        return checkpoint
+
+    def save(self):
+        state = {
+            'fingerprint': self.fingerprint,
+            'batch_size': self.batch_size,
+            'mode': self.mode,
+            'last_batch': self.last_batch,
+            'completed_stages': self.completed_stages,
+            'complete': self.complete,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+        # Write then rename, so an interrupted save never leaves a truncated checkpoint
+        staging = self.path + '.tmp'
+        with open(staging, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(staging, self.path)
+
+    def commit_batch(self, batch_num):
+        self.last_batch = batch_num
+        self.save()
+
+    def commit_stage(self, stage):
+        if stage not in self.completed_stages:
+            self.completed_stages.append(stage)
+        self.save()
+
+    def finish(self):
+        """Mark the load complete; only call after a run in which every batch committed"""
+        self.complete = True
+        self.save()
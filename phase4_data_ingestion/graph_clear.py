@@ -0,0 +1,103 @@
+"""
+Phase 4 Graph Clear
+Delete every relationship, then every node, in bounded transactions
+
+A single `MATCH (n) DETACH DELETE n` holds the whole delete in one
+transaction: memory grows with the graph and the database stays locked
+until it commits. Here relationships are deleted type by type and then
+nodes label by label, each in batches of a fixed number of rows. Each batch
+finds its rows through the relationship type / label lookup index rather
+than rescanning the store, so total time grows linearly with the graph and
+memory stays bounded by the batch size.
+
+Batches are either sent one by one from the client (with progress output)
+or run server-side with CALL { ... } IN TRANSACTIONS (Neo4j 4.4+).
+"""
+
+import os
+import time
+
+from schema_manager import CONSTRAINTS, INDEXES, ensure_schema
+
+CLEAR_BATCH_SIZE = int(os.getenv('CLEAR_BATCH_SIZE', '10000'))
+
+# Set CLEAR_IN_TRANSACTIONS=1 to batch on the server with CALL { ... } IN TRANSACTIONS
+CLEAR_IN_TRANSACTIONS = os.getenv('CLEAR_IN_TRANSACTIONS', '0') == '1'
+
+# Set CLEAR_DROP_INDEXES=1 to drop the schema during the delete and recreate it afterwards
+CLEAR_DROP_INDEXES = os.getenv('CLEAR_DROP_INDEXES', '0') == '1'
+
+
+def drop_schema(graph):
+    """Drop the constraints and indexes declared in schema_manager, so deletes skip index maintenance"""
+    for name in INDEXES:
+        graph.run(f"DROP INDEX {name} IF EXISTS")
+    for name in CONSTRAINTS:
+        graph.run(f"DROP CONSTRAINT {name} IF EXISTS")
+
+
+def _delete_in_batches(graph, match, delete, batch_size, in_transactions, label, progress_every):
+    """Delete everything matched by `match` (binding x), batch_size rows per transaction"""
+    if in_transactions:
+        graph.run(f"{match} CALL {{ WITH x {delete} }} IN TRANSACTIONS OF $batch_size ROWS",
+                  batch_size=batch_size)
+        return None
+    deleted, batches = 0, 0
+    while True:
+        count = graph.run(f"{match} WITH x LIMIT $batch_size {delete} RETURN COUNT(*) AS deleted",
+                          batch_size=batch_size).evaluate() or 0
+        deleted += count
+        batches += 1
+        if progress_every and batches % progress_every == 0:
+            print(f"    {label}: {deleted:,} deleted...")
+        if count < batch_size:
+            return deleted
+
+
+def clear_graph(graph, batch_size=CLEAR_BATCH_SIZE, in_transactions=CLEAR_IN_TRANSACTIONS,
+                drop_indexes=CLEAR_DROP_INDEXES, progress_every=10):
+    """
+    Delete all relationships, then all nodes, in batches of batch_size.
+    Returns {'relationships', 'nodes', 'seconds'} with the counts found
+    before deleting.
+    """
+    start = time.perf_counter()
+    total_relationships = graph.run("MATCH ()-[r]->() RETURN COUNT(r)").evaluate() or 0
+    total_nodes = graph.run("MATCH (n) RETURN COUNT(n)").evaluate() or 0
+    print(f"  Deleting {total_relationships:,} relationships and {total_nodes:,} nodes "
+          f"in batches of {batch_size:,}...")
+    if drop_indexes:
+        drop_schema(graph)
+        print("  Dropped constraints and indexes for the delete")
+
+    delete_error = None
+    try:
+        rel_types = [row['relationshipType'] for row in graph.run("CALL db.relationshipTypes()").data()]
+        labels = [row['label'] for row in graph.run("CALL db.labels()").data()]
+        for rel_type in rel_types:
+            deleted = _delete_in_batches(graph, f"MATCH ()-[x:`{rel_type}`]->()", "DELETE x", batch_size,
+                                         in_transactions, rel_type, progress_every)
+            print(f"  ✓ {rel_type}" + (f": {deleted:,} relationships deleted" if deleted is not None else ""))
+        for label in labels:
+            deleted = _delete_in_batches(graph, f"MATCH (x:`{label}`)", "DETACH DELETE x", batch_size,
+                                         in_transactions, label, progress_every)
+            print(f"  ✓ {label}" + (f": {deleted:,} nodes deleted" if deleted is not None else ""))
+        # Nodes without a label
+        _delete_in_batches(graph, "MATCH (x)", "DETACH DELETE x", batch_size, in_transactions, 'unlabeled', 0)
+    except Exception as e:
+        delete_error = e
+        raise
+    finally:
+        # Recreate the schema even when the delete fails partway, so MERGE keys stay constrained
+        if drop_indexes:
+            try:
+                ensure_schema(graph)
+                print("  Recreated constraints and indexes")
+            except Exception as schema_error:
+                if delete_error is None:
+                    raise
+                # Keep the delete failure visible; it is the root cause
+                print(f"  ✗ Delete failed: {delete_error}")
+                print(f"  ✗ Could not recreate constraints and indexes: {schema_error}")
+                raise schema_error from delete_error
+    return {'relationships': total_relationships, 'nodes': total_nodes, 'seconds': time.perf_counter() - start}
@@ -0,0 +1,149 @@
+"""
+Phase 4 Graph Data
+Node and relationship rows for the graph, built from the cleaned dataset with vectorized pandas
+
+Shared by the Cypher ingestion (as UNWIND parameter lists) and the
+neo4j-admin import export (as CSV files), so both paths load the same
+graph.
+"""
+
+import ast
+
+import numpy as np
+import pandas as pd
+
+# Country name mapping
+COUNTRY_NAMES = {
+    'US': 'United States',
+    'GB': 'Great Britain',
+    'CA': 'Canada',
+    'IN': 'India'
+}
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Relationship type -> ((start label, start key), (end label, end key))
+RELATIONSHIPS = {
+    'VIDEO_BELONGS_TO_CATEGORY': (('Video', 'video_unique_id'), ('Category', 'category_id')),
+    'VIDEO_PUBLISHED_BY_CHANNEL': (('Video', 'video_unique_id'), ('Channel', 'channel_title')),
+    'CHANNEL_HAS_VIDEO': (('Channel', 'channel_title'), ('Video', 'video_unique_id')),
+    'VIDEO_TRENDING_IN_COUNTRY': (('Video', 'video_unique_id'), ('Country', 'country_code')),
+    'VIDEO_TRENDING_ON': (('Video', 'video_unique_id'), ('Day', 'day_name')),
+    'VIDEO_HAS_TAG': (('Video', 'video_unique_id'), ('Tag', 'tag_name')),
+}
+
+
+def parse_tags_safe(x):
+    """Parse a tags_list cell (list, its string repr, or a single tag) into a list"""
+    if isinstance(x, list):
+        return x
+    if pd.isna(x) or x == '' or x == '[]':
+        return []
+    if isinstance(x, str):
+        try:
+            if x.startswith('[') and x.endswith(']'):
+                return ast.literal_eval(x)
+            else:
+                return [x]
+        except:
+            return []
+    return []
+
+
+def load_cleaned_dataset(path='youtube_trending_cleaned.csv'):
+    """Read the Phase 2 output with parsed dates and tag lists"""
+    df = pd.read_csv(path)
+    df['trending_date'] = pd.to_datetime(df['trending_date'])
+    df['publish_time'] = pd.to_datetime(df['publish_time'])
+    if df['tags_list'].dtype == 'object':
+        df['tags_list'] = df['tags_list'].apply(parse_tags_safe)
+    return df
+
+
+def cleaned_tags(df):
+    """One cleaned tag per (row, tag), indexed by row label; surrounding quotes/whitespace stripped, empties dropped"""
+    tags = df['tags_list'].explode()
+    tags = tags[tags.map(lambda tag: isinstance(tag, str))]
+    cleaned = tags.str.strip('"\'').str.strip()
+    return cleaned[cleaned != '']
+
+
+def country_rows(df):
+    countries = pd.DataFrame({'country_code': df['country'].astype(str).unique()})
+    countries['country_name'] = countries['country_code'].map(COUNTRY_NAMES).fillna(countries['country_code'])
+    return countries
+
+
+def category_rows(df):
+    categories = df[['category_id', 'category_name']].drop_duplicates()
+    return pd.DataFrame({'category_id': categories['category_id'].astype(np.int64),
+                         'category_name': categories['category_name'].astype(str)})
+
+
+def channel_rows(df):
+    """Channels with aggregated total_views, avg_engagement_ratio and video_count"""
+    channel_stats = df.groupby('channel_title').agg({
+        'views': 'sum',
+        'engagement_ratio': 'mean',
+        'video_id': 'count'
+    }).reset_index()
+    channel_stats.columns = ['channel_title', 'total_views', 'avg_engagement_ratio', 'video_count']
+    return pd.DataFrame({'channel_title': channel_stats['channel_title'].astype(str),
+                         'total_views': channel_stats['total_views'].astype(np.int64),
+                         'avg_engagement_ratio': channel_stats['avg_engagement_ratio'].astype(float),
+                         'video_count': channel_stats['video_count'].astype(np.int64)})
+
+
+def video_rows(df):
+    """Video properties plus the keys of their category, channel, country and day"""
+    video_id = df['video_id'].astype(str)
+    country_code = df['country'].astype(str)
+    return pd.DataFrame({
+        'video_unique_id': video_id + '_' + country_code,
+        'video_id': video_id,
+        # Limit title length (parameterized queries handle special characters automatically)
+        'title': df['title'].fillna('').astype(str).str[:200],
+        'views': df['views'].fillna(0).astype(np.int64),
+        'likes': df['likes'].fillna(0).astype(float),
+        'dislikes': df['dislikes'].fillna(0).astype(float),
+        'comment_count': df['comment_count'].fillna(0).astype(np.int64),
+        'engagement_ratio': df['engagement_ratio'].fillna(0).astype(float),
+        'like_dislike_ratio': df['like_dislike_ratio'].fillna(0).astype(float),
+        'trending_date': df['trending_date'].dt.strftime('%Y-%m-%d').fillna(''),
+        'publish_time': df['publish_time'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna(''),
+        'days_to_trend': df['days_to_trend'].fillna(0).astype(np.int64),
+        'country_code': country_code,
+        'category_id': df['category_id'].astype(np.int64),
+        'channel_title': df['channel_title'].astype(str),
+        'trending_day': df['trending_day_of_week'].where(df['trending_day_of_week'].notna(), None),
+    })
+
+
+def tag_relationships(df, video_unique_ids, known_tags=None):
+    """(row position, video_unique_id, tag_name) for every cleaned tag, ordered by row"""
+    tags = cleaned_tags(df)
+    if known_tags is not None:
+        tags = tags[tags.isin(list(known_tags))]
+    positions = df.index.get_indexer(tags.index)
+    return pd.DataFrame({'position': positions,
+                         'video_unique_id': np.asarray(video_unique_ids)[positions],
+                         'tag_name': tags.to_numpy()})
+
+
+def relationship_rows(df, videos=None):
+    """
+    Distinct (start key, end key) pairs for every relationship type, with
+    columns named after the key properties in RELATIONSHIPS.
+    """
+    videos = video_rows(df) if videos is None else videos
+    days = videos[videos['trending_day'].isin(DAYS)].rename(columns={'trending_day': 'day_name'})
+    pairs = {
+        'VIDEO_BELONGS_TO_CATEGORY': videos,
+        'VIDEO_PUBLISHED_BY_CHANNEL': videos,
+        'CHANNEL_HAS_VIDEO': videos,
+        'VIDEO_TRENDING_IN_COUNTRY': videos,
+        'VIDEO_TRENDING_ON': days,
+        'VIDEO_HAS_TAG': tag_relationships(df, videos['video_unique_id']),
+    }
+    return {rel_type: pairs[rel_type][[start_key, end_key]].drop_duplicates().reset_index(drop=True)
+            for rel_type, ((_, start_key), (_, end_key)) in RELATIONSHIPS.items()}
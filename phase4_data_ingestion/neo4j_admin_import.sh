@@ -0,0 +1,39 @@
+#!/usr/bin/env bash
+# Phase 4 bulk load: import the CSVs written by admin_import.py (or
+# INGESTION_MODE=admin_import python phase4_graph_ingestion.py) into an
+# empty database with neo4j-admin, then apply the schema.
+#
+# Usage: ./neo4j_admin_import.sh [import_dir] [database]
+# The database must be stopped (or not yet created). Set NEO4J_HOME to use
+# a specific installation's bin/neo4j-admin.
+set -euo pipefail
+
+IMPORT_DIR="${1:-${ADMIN_IMPORT_DIR:-phase4_import}}"
+DATABASE="${2:-${NEO4J_DATABASE:-neo4j}}"
+NEO4J_ADMIN="${NEO4J_HOME:+$NEO4J_HOME/bin/}neo4j-admin"
+
+if [ ! -f "$IMPORT_DIR/videos.csv" ]; then
+    echo "✗ Error: $IMPORT_DIR/videos.csv not found. Run: python admin_import.py $IMPORT_DIR"
+    exit 1
+fi
+
+"$NEO4J_ADMIN" database import full \
+    --nodes=Video="$IMPORT_DIR/videos.csv" \
+    --nodes=Channel="$IMPORT_DIR/channels.csv" \
+    --nodes=Category="$IMPORT_DIR/categories.csv" \
+    --nodes=Country="$IMPORT_DIR/countries.csv" \
+    --nodes=Tag="$IMPORT_DIR/tags.csv" \
+    --nodes=Day="$IMPORT_DIR/days.csv" \
+    --relationships=VIDEO_BELONGS_TO_CATEGORY="$IMPORT_DIR/video_belongs_to_category.csv" \
+    --relationships=VIDEO_PUBLISHED_BY_CHANNEL="$IMPORT_DIR/video_published_by_channel.csv" \
+    --relationships=CHANNEL_HAS_VIDEO="$IMPORT_DIR/channel_has_video.csv" \
+    --relationships=VIDEO_TRENDING_IN_COUNTRY="$IMPORT_DIR/video_trending_in_country.csv" \
+    --relationships=VIDEO_TRENDING_ON="$IMPORT_DIR/video_trending_on.csv" \
+    --relationships=VIDEO_HAS_TAG="$IMPORT_DIR/video_has_tag.csv" \
+    --multiline-fields=true \
+    --overwrite-destination=true \
+    "$DATABASE"
+
+echo "✓ Imported $IMPORT_DIR into database '$DATABASE'"
+echo "  Next: start Neo4j (CREATE DATABASE $DATABASE if it is not the default), then apply"
+echo "  constraints and indexes with: python schema_manager.py"
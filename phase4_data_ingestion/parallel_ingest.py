@@ -0,0 +1,148 @@
+"""
+Phase 4 Parallel Ingestion
+Contention-aware writer workers with one connection each
+
+A single writer leaves the database idle between round trips. Here each of
+N worker threads owns its own Graph connection and writes its own partition
+of the rows in UNWIND batches. Rows are partitioned by a stable hash of the
+node that concurrent transactions would otherwise fight over, so no two
+workers lock the same node:
+
+- Video nodes by video_unique_id
+- VIDEO_HAS_TAG by tag, channel relationships by channel, and the other
+  relationships by their Category/Country/Day node
+
+Writes of one kind run together and finish before the next kind starts.
+Remaining lock conflicts on the Video side (e.g. two tag workers touching
+the same video) surface as transient errors such as DeadlockDetected and
+are retried with jittered exponential backoff; MERGE makes retries safe.
+"""
+
+import os
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from py2neo.errors import TransientError
+
+from graph_data import RELATIONSHIPS
+
+# Number of writer workers (1 keeps the sequential per-batch ingestion)
+INGESTION_WORKERS = int(os.getenv('INGESTION_WORKERS', '1'))
+
+# Retries per batch for transient failures (deadlocks, lock timeouts)
+DEADLOCK_RETRIES = int(os.getenv('DEADLOCK_RETRIES', '8'))
+RETRY_BACKOFF_SECONDS = 0.05
+
+
+def relationship_query(rel_type):
+    """UNWIND query that MERGEs one relationship type between nodes matched by their keys"""
+    (start_label, start_key), (end_label, end_key) = RELATIONSHIPS[rel_type]
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:{start_label} {{{start_key}: row.{start_key}}})
+    MATCH (b:{end_label} {{{end_key}: row.{end_key}}})
+    MERGE (a)-[:{rel_type}]->(b)
+    """
+
+
+def partition_key(rel_type):
+    """Key of the shared (non-Video) endpoint, whose lock concurrent batches would contend for"""
+    (start_label, start_key), (_, end_key) = RELATIONSHIPS[rel_type]
+    return end_key if start_label == 'Video' else start_key
+
+
+def partition_ids(keys, workers):
+    """Worker index per key from a stable hash, so a key always maps to the same worker"""
+    hashes = pd.util.hash_pandas_object(pd.Series(keys).astype(str), index=False).to_numpy()
+    return (hashes % np.uint64(workers)).astype(np.int64)
+
+
+def is_transient(error):
+    code = getattr(error, 'code', None) or ''
+    return isinstance(error, TransientError) or code.startswith('Neo.TransientError') \
+        or 'DeadlockDetected' in str(error)
+
+
+def run_with_retry(graph, query, retries=DEADLOCK_RETRIES, backoff=RETRY_BACKOFF_SECONDS, **parameters):
+    """Run a write query, retrying transient failures with backoff; returns the number of retries"""
+    for attempt in range(retries + 1):
+        try:
+            graph.run(query, **parameters)
+            return attempt
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            time.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+
+
+class WriterPool:
+    """Writer workers, each with its own connection from connect()"""
+
+    def __init__(self, connect, workers=INGESTION_WORKERS):
+        self.graphs = [connect() for _ in range(workers)]
+
+    def __len__(self):
+        return len(self.graphs)
+
+    def _write_partition(self, graph, query, rows, batch_size):
+        written, failed, retries = 0, 0, 0
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i+batch_size]
+            try:
+                retries += run_with_retry(graph, query, rows=batch)
+                written += len(batch)
+            except Exception as e:
+                print(f"    ⚠️  Batch of {len(batch)} rows failed: {e}")
+                failed += len(batch)
+        return written, failed, retries
+
+    def write(self, query, rows, key, batch_size):
+        """
+        Write a DataFrame of UNWIND rows, partitioned across workers by the
+        hash of rows[key]. Each worker writes its partition in batches,
+        sorted by key so a batch touches as few shared nodes as possible.
+        Returns {'rows', 'failed', 'retries', 'seconds'}.
+        """
+        start = time.perf_counter()
+        rows = rows.assign(_worker=partition_ids(rows[key], len(self)))
+        rows = rows.sort_values(['_worker', key], kind='stable')
+        partitions = [part.drop(columns='_worker').to_dict('records') for _, part in rows.groupby('_worker')]
+        with ThreadPoolExecutor(max_workers=len(self)) as executor:
+            futures = [executor.submit(self._write_partition, graph, query, partition, batch_size)
+                       for graph, partition in zip(self.graphs, partitions)]
+            results = [future.result() for future in futures]
+        written, failed, retries = (sum(column) for column in zip(*results)) if results else (0, 0, 0)
+        return {'rows': written, 'failed': failed, 'retries': retries, 'seconds': time.perf_counter() - start}
+
+
+def ingest_parallel(pool, video_query, videos, relationships, batch_size, checkpoint=None):
+    """
+    Write Video nodes, then each relationship type, through the pool.
+    videos holds the video rows; relationships maps type -> key pairs
+    (graph_data.relationship_rows). Stages already recorded in the
+    checkpoint are skipped. A stage is committed to the checkpoint only if
+    it and every stage before it wrote all rows (relationship stages MATCH
+    the videos of earlier stages). Returns {stage: write stats}.
+    """
+    stages = [('Video', video_query, videos, 'video_unique_id', 'nodes')]
+    stages += [(rel_type, relationship_query(rel_type), pairs, partition_key(rel_type), 'relationships')
+               for rel_type, pairs in relationships.items()]
+    stats = {}
+    clean = True
+    for stage, query, rows, key, noun in stages:
+        if checkpoint is not None and stage in checkpoint.completed_stages:
+            stats[stage] = {'rows': len(rows), 'failed': 0, 'retries': 0, 'seconds': 0.0}
+            print(f"  {stage}: already written (checkpoint)")
+            continue
+        stats[stage] = pool.write(query, rows, key, batch_size)
+        print(f"  {stage}: {stats[stage]['rows']:,} {noun} in {stats[stage]['seconds']:.1f}s "
+              f"({stats[stage]['retries']} retries)")
+        if stats[stage]['failed']:
+            print(f"    ⚠️  {stats[stage]['failed']:,} {noun} failed; this stage will be redone on the next run")
+            clean = False
+        if checkpoint is not None and clean:
+            checkpoint.commit_stage(stage)
+    return stats
@@ -7,13 +7,19 @@ import pandas as pd
 import numpy as np
 from py2neo import Graph, Node, Relationship, Transaction
 from py2neo.database import Transaction as Tx
-import ast
 import os
 from datetime import datetime
 import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from schema_manager import ensure_schema, SchemaError, CONSTRAINTS, INDEXES
+from graph_data import (COUNTRY_NAMES, DAYS, load_cleaned_dataset, cleaned_tags, country_rows,
+                        category_rows, channel_rows, video_rows, tag_relationships, relationship_rows)
+from parallel_ingest import WriterPool, ingest_parallel, INGESTION_WORKERS
+from checkpoint import IngestionCheckpoint, dataset_fingerprint, CHECKPOINT_FILE
+from graph_clear import clear_graph
+
 # Configuration
 # Neo4j Desktop Local Database
 NEO4J_URI = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
@@ -21,19 +27,37 @@ NEO4J_USER = os.getenv('NEO4J_USER', 'neo4j')
 NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', 'your_password_here')
 NEO4J_DATABASE = os.getenv('NEO4J_DATABASE', 'neo4j')
 BATCH_SIZE = 1000  # Number of rows to process per batch
-
-# Country name mapping
-COUNTRY_NAMES = {
-    'US': 'United States',
-    'GB': 'Great Britain',
-    'CA': 'Canada',
-    'IN': 'India'
-}
+# 'cypher' loads through Bolt; 'admin_import' only writes neo4j-admin import CSVs (no connection needed)
+INGESTION_MODE = os.getenv('INGESTION_MODE', 'cypher')
+# Set CLEAR_DATABASE=1 to delete all nodes and relationships (and the checkpoint) before loading
+CLEAR_DATABASE = os.getenv('CLEAR_DATABASE', '0') == '1'
 
 print("=" * 80)
 print("PHASE 4: GRAPH DATABASE SETUP AND DATA INGESTION")
 print("=" * 80)
 
+if INGESTION_MODE == 'admin_import':
+    # Offline bulk load: write the CSVs for neo4j-admin database import and stop
+    from admin_import import write_import_files, ADMIN_IMPORT_DIR
+
+    print(f"\n[1] Writing neo4j-admin Import Files to {ADMIN_IMPORT_DIR}/...")
+    print("-" * 80)
+    try:
+        df = load_cleaned_dataset('youtube_trending_cleaned.csv')
+    except FileNotFoundError:
+        print("✗ Error: youtube_trending_cleaned.csv not found. Please run Phase 2 first.")
+        exit(1)
+    export_start = datetime.now()
+    for name, rows in write_import_files(df, ADMIN_IMPORT_DIR).items():
+        print(f"  {name}: {rows:,} rows")
+    print(f"✓ Wrote import files in {(datetime.now() - export_start).total_seconds():.2f}s")
+    print(f"\nNext: ./neo4j_admin_import.sh {ADMIN_IMPORT_DIR} {NEO4J_DATABASE} (with Neo4j stopped), "
+          f"then start Neo4j and run python schema_manager.py")
+    exit(0)
+elif INGESTION_MODE != 'cypher':
+    print(f"✗ Error: unknown INGESTION_MODE '{INGESTION_MODE}' (expected 'cypher' or 'admin_import')")
+    exit(1)
+
 # ============================================================================
 # STEP 1: Database Setup and Connection
 # ============================================================================
@@ -70,15 +94,27 @@ if graph is None:
 # STEP 2: Clear Existing Data (Optional - for fresh start)
 # ============================================================================
 
-print("\n[2] Clearing Existing Data (if any)...")
+print("\n[2] Clearing Existing Data (if requested)...")
 print("-" * 80)
 
-try:
-    # Delete all nodes and relationships
-    graph.run("MATCH (n) DETACH DELETE n")
-    print("✓ Cleared existing data from database")
-except Exception as e:
-    print(f"⚠️  Error clearing data: {e}")
+if CLEAR_DATABASE:
+    # Progress recorded against the old contents no longer applies. Remove it
+    # before deleting: the clear runs in many transactions, so a failure
+    # partway leaves a half-deleted graph that the checkpoint must not vouch for
+    if os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
+        print(f"✓ Removed checkpoint {CHECKPOINT_FILE}")
+    try:
+        # Delete all relationships, then all nodes, in bounded batches
+        cleared = clear_graph(graph)
+        print(f"✓ Cleared existing data from database ({cleared['relationships']:,} relationships, "
+              f"{cleared['nodes']:,} nodes in {cleared['seconds']:.1f}s)")
+    except Exception as e:
+        print(f"✗ Error clearing data: {e}")
+        print("  The database may be partially cleared; rerun with CLEAR_DATABASE=1 to finish the clear.")
+        exit(1)
+else:
+    print("✓ Keeping existing data (set CLEAR_DATABASE=1 to clear the database first)")
 
 # ============================================================================
 # STEP 3: Load and Prepare Data
@@ -88,86 +124,53 @@ print("\n[3] Loading Cleaned Dataset...")
 print("-" * 80)
 
 try:
-    df = pd.read_csv('youtube_trending_cleaned.csv')
+    df = load_cleaned_dataset('youtube_trending_cleaned.csv')
     print(f"✓ Loaded dataset: {len(df):,} rows, {len(df.columns)} columns")
 except FileNotFoundError:
     print("✗ Error: youtube_trending_cleaned.csv not found. Please run Phase 2 first.")
     exit(1)
 
-# Parse dates
-df['trending_date'] = pd.to_datetime(df['trending_date'])
-df['publish_time'] = pd.to_datetime(df['publish_time'])
-
-# Parse tags_list
-def parse_tags_safe(x):
-    if pd.isna(x) or x == '' or x == '[]':
-        return []
-    if isinstance(x, list):
-        return x
-    if isinstance(x, str):
-        try:
-            if x.startswith('[') and x.endswith(']'):
-                return ast.literal_eval(x)
-            else:
-                return [x]
-        except:
-            return []
-    return []
-
-if df['tags_list'].dtype == 'object':
-    df['tags_list'] = df['tags_list'].apply(parse_tags_safe)
-
-# Clean tag names (remove extra quotes and normalize)
-def clean_tag(tag):
-    if isinstance(tag, str):
-        # Remove extra quotes
-        tag = tag.strip('"\'')
-        # Remove empty strings
-        if tag == '' or tag == '""':
-            return None
-        return tag.strip()
-    return None
-
 print(f"✓ Data prepared for ingestion")
 
+ingestion_mode = 'parallel' if INGESTION_WORKERS > 1 else 'sequential'
+checkpoint = IngestionCheckpoint.load(dataset_fingerprint('youtube_trending_cleaned.csv'), BATCH_SIZE, ingestion_mode)
+if checkpoint.status == 'resumed' and checkpoint.complete:
+    print(f"✓ Checkpoint {CHECKPOINT_FILE}: this dataset is already fully ingested, video "
+          f"batches will be skipped (delete it or set CLEAR_DATABASE=1 to reload)")
+elif checkpoint.status == 'resumed' and ingestion_mode == 'parallel':
+    print(f"✓ Resuming from checkpoint {CHECKPOINT_FILE}: stages already committed: "
+          f"{', '.join(checkpoint.completed_stages) or 'none'}")
+elif checkpoint.status == 'resumed':
+    print(f"✓ Resuming from checkpoint {CHECKPOINT_FILE}: {checkpoint.last_batch + 1} video batches "
+          f"already committed")
+elif checkpoint.status == 'mismatch':
+    print(f"⚠️  Checkpoint {CHECKPOINT_FILE} is for a different dataset, batch size or ingestion mode; "
+          f"starting from the first batch (existing nodes are updated in place)")
+else:
+    print(f"✓ No checkpoint found; progress will be saved to {CHECKPOINT_FILE}")
+
 # ============================================================================
 # STEP 4: Create Indexes
 # ============================================================================
 
-print("\n[4] Creating Indexes...")
+print("\n[4] Applying Schema (Constraints and Indexes)...")
 print("-" * 80)
 
-indexes = [
-    # Video indexes
-    "CREATE INDEX video_id_index IF NOT EXISTS FOR (v:Video) ON (v.video_id)",
-    "CREATE INDEX video_trending_date_index IF NOT EXISTS FOR (v:Video) ON (v.trending_date)",
-    "CREATE INDEX video_views_index IF NOT EXISTS FOR (v:Video) ON (v.views)",
-    "CREATE INDEX video_engagement_index IF NOT EXISTS FOR (v:Video) ON (v.engagement_ratio)",
-    
-    # Channel indexes
-    "CREATE INDEX channel_title_index IF NOT EXISTS FOR (ch:Channel) ON (ch.channel_title)",
-    "CREATE INDEX channel_total_views_index IF NOT EXISTS FOR (ch:Channel) ON (ch.total_views)",
-    
-    # Category indexes
-    "CREATE INDEX category_name_index IF NOT EXISTS FOR (c:Category) ON (c.category_name)",
-    
-    # Country indexes
-    "CREATE INDEX country_code_index IF NOT EXISTS FOR (co:Country) ON (co.country_code)",
-    
-    # Tag indexes
-    "CREATE INDEX tag_name_index IF NOT EXISTS FOR (t:Tag) ON (t.tag_name)",
-    
-    # Day indexes
-    "CREATE INDEX day_name_index IF NOT EXISTS FOR (d:Day) ON (d.day_name)",
-]
+# Every key used in MERGE/MATCH needs an index, or each lookup scans the whole label
+try:
+    created_schema = ensure_schema(graph)
+except SchemaError as e:
+    print(f"✗ Required schema is incomplete: {e}")
+    print("   Refusing to ingest without indexes on MERGE/MATCH keys.")
+    exit(1)
+except Exception as e:
+    print(f"✗ Failed to apply schema: {e}")
+    exit(1)
 
-for index_query in indexes:
-    try:
-        graph.run(index_query)
-        index_name = index_query.split("INDEX")[1].split("IF")[0].strip()
-        print(f"✓ Created index: {index_name}")
-    except Exception as e:
-        print(f"⚠️  Index creation warning: {e}")
+for name in created_schema:
+    print(f"✓ Created: {name}")
+print(f"✓ Schema verified with SHOW INDEXES: {len(CONSTRAINTS)} uniqueness constraints, "
+      f"{len(INDEXES)} indexes ONLINE")
 
 # ============================================================================
 # STEP 5: Create Nodes - Countries
@@ -176,20 +179,24 @@ for index_query in indexes:
 print("\n[5] Creating Country Nodes...")
 print("-" * 80)
 
-countries = df['country'].unique()
-country_nodes = {}
+DIMENSION_BATCH_SIZE = 10000  # Dimension rows per UNWIND query
+
+def merge_dimension_nodes(graph, query, rows, batch_size=DIMENSION_BATCH_SIZE):
+    """Write dimension nodes with one UNWIND query per batch of parameter rows"""
+    for i in range(0, len(rows), batch_size):
+        graph.run(query, rows=rows[i:i+batch_size])
+    return len(rows)
 
-for country_code in countries:
-    country_name = COUNTRY_NAMES.get(country_code, country_code)
-    # Use Cypher MERGE for better performance
-    graph.run("""
-        MERGE (co:Country {country_code: $country_code})
-        SET co.country_name = $country_name
-    """, country_code=country_code, country_name=country_name)
-    country_nodes[country_code] = country_code  # Store code for reference
-    print(f"✓ Created Country node: {country_code} ({country_name})")
+dimension_start = datetime.now()
 
-print(f"✓ Created {len(country_nodes)} Country nodes")
+countries = country_rows(df)
+country_count = merge_dimension_nodes(graph, """
+    UNWIND $rows AS row
+    MERGE (co:Country {country_code: row.country_code})
+    SET co.country_name = row.country_name
+""", countries.to_dict('records'))
+print(f"✓ Created Country nodes: {', '.join(countries['country_code'] + ' (' + countries['country_name'] + ')')}")
+print(f"✓ Created {country_count} Country nodes")
 
 # ============================================================================
 # STEP 6: Create Nodes - Categories
@@ -198,21 +205,14 @@ print(f"✓ Created {len(country_nodes)} Country nodes")
 print("\n[6] Creating Category Nodes...")
 print("-" * 80)
 
-categories = df[['category_id', 'category_name']].drop_duplicates()
-category_nodes = {}
-
-for _, row in categories.iterrows():
-    category_id = int(row['category_id'])
-    category_name = str(row['category_name'])
-    # Use Cypher MERGE for better performance
-    graph.run("""
-        MERGE (c:Category {category_id: $category_id})
-        SET c.category_name = $category_name
-    """, category_id=category_id, category_name=category_name)
-    category_nodes[category_id] = category_id  # Store ID for reference
-    print(f"✓ Created Category node: {category_id} ({category_name})")
-
-print(f"✓ Created {len(category_nodes)} Category nodes")
+categories = category_rows(df)
+category_count = categories['category_id'].nunique()
+merge_dimension_nodes(graph, """
+    UNWIND $rows AS row
+    MERGE (c:Category {category_id: row.category_id})
+    SET c.category_name = row.category_name
+""", categories.to_dict('records'))
+print(f"✓ Created {category_count} Category nodes")
 
 # ============================================================================
 # STEP 7: Create Nodes - Channels (with aggregated stats)
@@ -221,29 +221,16 @@ print(f"✓ Created {len(category_nodes)} Category nodes")
 print("\n[7] Creating Channel Nodes...")
 print("-" * 80)
 
-channel_stats = df.groupby('channel_title').agg({
-    'views': 'sum',
-    'engagement_ratio': 'mean',
-    'video_id': 'count'
-}).reset_index()
-channel_stats.columns = ['channel_title', 'total_views', 'avg_engagement_ratio', 'video_count']
-
-channel_nodes = {}
-# Batch create channel nodes for better performance
-for _, row in channel_stats.iterrows():
-    channel_title = str(row['channel_title'])
-    graph.run("""
-        MERGE (ch:Channel {channel_title: $channel_title})
-        SET ch.total_views = $total_views,
-            ch.avg_engagement_ratio = $avg_engagement_ratio,
-            ch.video_count = $video_count
-    """, channel_title=channel_title,
-        total_views=int(row['total_views']),
-        avg_engagement_ratio=float(row['avg_engagement_ratio']),
-        video_count=int(row['video_count']))
-    channel_nodes[channel_title] = channel_title  # Store title for reference
-
-print(f"✓ Created {len(channel_nodes):,} Channel nodes")
+channel_stats = channel_rows(df)
+channel_count = merge_dimension_nodes(graph, """
+    UNWIND $rows AS row
+    MERGE (ch:Channel {channel_title: row.channel_title})
+    SET ch.total_views = row.total_views,
+        ch.avg_engagement_ratio = row.avg_engagement_ratio,
+        ch.video_count = row.video_count
+""", channel_stats.to_dict('records'))
+
+print(f"✓ Created {channel_count:,} Channel nodes")
 
 # ============================================================================
 # STEP 8: Create Nodes - Tags
@@ -252,13 +239,7 @@ print(f"✓ Created {len(channel_nodes):,} Channel nodes")
 print("\n[8] Creating Tag Nodes...")
 print("-" * 80)
 
-all_tags = set()
-for tags_list in df['tags_list']:
-    if isinstance(tags_list, list):
-        for tag in tags_list:
-            cleaned_tag = clean_tag(tag)
-            if cleaned_tag and len(cleaned_tag) > 0:
-                all_tags.add(cleaned_tag)
+all_tags = cleaned_tags(df).unique()
 
 tag_nodes = {}
 # Batch create tag nodes using UNWIND for better performance
@@ -299,15 +280,12 @@ print(f"✓ Created {len(tag_nodes):,} Tag nodes")
 print("\n[9] Creating Day-of-Week Nodes...")
 print("-" * 80)
 
-days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-day_nodes = {}
-
-for day_name in days:
-    graph.run("MERGE (d:Day {day_name: $day_name})", day_name=day_name)
-    day_nodes[day_name] = day_name  # Store name for reference
-    print(f"✓ Created Day node: {day_name}")
-
-print(f"✓ Created {len(day_nodes)} Day nodes")
+day_count = merge_dimension_nodes(graph, """
+    UNWIND $rows AS row
+    MERGE (d:Day {day_name: row.day_name})
+""", [{'day_name': day_name} for day_name in DAYS])
+print(f"✓ Created {day_count} Day nodes")
+print(f"✓ Dimension nodes (Country, Category, Channel, Tag, Day) written in {(datetime.now() - dimension_start).total_seconds():.2f}s")
 
 # ============================================================================
 # STEP 10: Create Video Nodes and Relationships (Batch Processing)
@@ -316,210 +294,145 @@ print(f"✓ Created {len(day_nodes)} Day nodes")
 print("\n[10] Creating Video Nodes and Relationships (Batch Processing)...")
 print("-" * 80)
 
-def create_video_batch(batch_rows, graph, country_nodes, category_nodes, 
-                       channel_nodes, tag_nodes, day_nodes):
-    """Create video nodes and relationships in batch for better performance"""
-    
-    batch_data = []
-    for _, row in batch_rows.iterrows():
-        # Prepare video properties
-        video_id = str(row['video_id'])
-        title = str(row['title']) if pd.notna(row['title']) else ""
-        # Limit title length (parameterized queries handle special characters automatically)
-        title = title[:200]
-        views = int(row['views']) if pd.notna(row['views']) else 0
-        likes = float(row['likes']) if pd.notna(row['likes']) else 0.0
-        dislikes = float(row['dislikes']) if pd.notna(row['dislikes']) else 0.0
-        comment_count = int(row['comment_count']) if pd.notna(row['comment_count']) else 0
-        engagement_ratio = float(row['engagement_ratio']) if pd.notna(row['engagement_ratio']) else 0.0
-        like_dislike_ratio = float(row['like_dislike_ratio']) if pd.notna(row['like_dislike_ratio']) else 0.0
-        trending_date = row['trending_date'].strftime('%Y-%m-%d') if pd.notna(row['trending_date']) else ""
-        publish_time = row['publish_time'].strftime('%Y-%m-%d %H:%M:%S') if pd.notna(row['publish_time']) else ""
-        days_to_trend = int(row['days_to_trend']) if pd.notna(row['days_to_trend']) else 0
-        
-        country_code = str(row['country'])
-        video_unique_id = f"{video_id}_{country_code}"
-        category_id = int(row['category_id'])
-        channel_title = str(row['channel_title'])
-        trending_day = str(row['trending_day_of_week']) if pd.notna(row['trending_day_of_week']) else None
-        
-        # Get cleaned tags
-        tags_list = row['tags_list']
-        cleaned_tags = []
-        if isinstance(tags_list, list):
-            for tag in tags_list:
-                cleaned_tag = clean_tag(tag)
-                if cleaned_tag and cleaned_tag in tag_nodes:
-                    cleaned_tags.append(cleaned_tag)
-        
-        batch_data.append({
-            'video_unique_id': video_unique_id,
-            'video_id': video_id,
-            'title': title,
-            'views': views,
-            'likes': likes,
-            'dislikes': dislikes,
-            'comment_count': comment_count,
-            'engagement_ratio': engagement_ratio,
-            'like_dislike_ratio': like_dislike_ratio,
-            'trending_date': trending_date,
-            'publish_time': publish_time,
-            'days_to_trend': days_to_trend,
-            'country_code': country_code,
-            'category_id': category_id,
-            'channel_title': channel_title,
-            'trending_day': trending_day,
-            'tags': cleaned_tags
-        })
-    
-    # Step 1: Create all video nodes and basic relationships (category, channel, country, day)
-    success_count = 0
-    video_unique_ids_created = []
-    
-    for data in batch_data:
-        try:
-            # Create video node and basic relationships in one transaction
-            query = """
-            MERGE (v:Video {video_unique_id: $video_unique_id})
-            SET v.video_id = $video_id,
-                v.title = $title,
-                v.views = $views,
-                v.likes = $likes,
-                v.dislikes = $dislikes,
-                v.comment_count = $comment_count,
-                v.engagement_ratio = $engagement_ratio,
-                v.like_dislike_ratio = $like_dislike_ratio,
-                v.trending_date = $trending_date,
-                v.publish_time = $publish_time,
-                v.days_to_trend = $days_to_trend,
-                v.country = $country_code
-            WITH v
-            MATCH (c:Category {category_id: $category_id})
-            MERGE (v)-[:VIDEO_BELONGS_TO_CATEGORY]->(c)
-            WITH v
-            MATCH (ch:Channel {channel_title: $channel_title})
-            MERGE (v)-[:VIDEO_PUBLISHED_BY_CHANNEL]->(ch)
-            MERGE (ch)-[:CHANNEL_HAS_VIDEO]->(v)
-            WITH v
-            MATCH (co:Country {country_code: $country_code})
-            MERGE (v)-[:VIDEO_TRENDING_IN_COUNTRY]->(co)
-            """
-            
-            params = {
-                'video_unique_id': data['video_unique_id'],
-                'video_id': data['video_id'],
-                'title': data['title'],
-                'views': data['views'],
-                'likes': data['likes'],
-                'dislikes': data['dislikes'],
-                'comment_count': data['comment_count'],
-                'engagement_ratio': data['engagement_ratio'],
-                'like_dislike_ratio': data['like_dislike_ratio'],
-                'trending_date': data['trending_date'],
-                'publish_time': data['publish_time'],
-                'days_to_trend': data['days_to_trend'],
-                'country_code': data['country_code'],
-                'category_id': data['category_id'],
-                'channel_title': data['channel_title']
-            }
-            
-            graph.run(query, **params)
-            
-            # Add day relationship if available
-            if data['trending_day'] and data['trending_day'] in day_nodes:
-                graph.run("""
-                    MATCH (v:Video {video_unique_id: $video_unique_id})
-                    MATCH (d:Day {day_name: $day_name})
-                    MERGE (v)-[:VIDEO_TRENDING_ON]->(d)
-                """, video_unique_id=data['video_unique_id'], day_name=data['trending_day'])
-            
-            video_unique_ids_created.append(data['video_unique_id'])
-            success_count += 1
-        except Exception as e:
-            # Silently skip errors for individual videos to continue processing
-            continue
-    
-    # Step 2: Batch create all tag relationships for this batch using UNWIND
-    # Collect all tag relationships from all videos in this batch
-    tag_relationships = []
-    for data in batch_data:
-        if data['video_unique_id'] in video_unique_ids_created and len(data['tags']) > 0:
-            for tag_name in data['tags']:
-                tag_relationships.append({
-                    'video_unique_id': data['video_unique_id'],
-                    'tag_name': tag_name
-                })
-    
-    # Create all tag relationships in one batch query using UNWIND
-    if len(tag_relationships) > 0:
+VIDEO_NODE_QUERY = """
+UNWIND $rows AS row
+MERGE (v:Video {video_unique_id: row.video_unique_id})
+SET v.video_id = row.video_id,
+    v.title = row.title,
+    v.views = row.views,
+    v.likes = row.likes,
+    v.dislikes = row.dislikes,
+    v.comment_count = row.comment_count,
+    v.engagement_ratio = row.engagement_ratio,
+    v.like_dislike_ratio = row.like_dislike_ratio,
+    v.trending_date = row.trending_date,
+    v.publish_time = row.publish_time,
+    v.days_to_trend = row.days_to_trend,
+    v.country = row.country_code
+"""
+
+# One UNWIND query per batch: Video nodes plus their category, channel (both directions),
+# country and day relationships, written in a single transaction
+VIDEO_BATCH_QUERY = VIDEO_NODE_QUERY + """WITH v, row
+MATCH (c:Category {category_id: row.category_id})
+MERGE (v)-[:VIDEO_BELONGS_TO_CATEGORY]->(c)
+WITH v, row
+MATCH (ch:Channel {channel_title: row.channel_title})
+MERGE (v)-[:VIDEO_PUBLISHED_BY_CHANNEL]->(ch)
+MERGE (ch)-[:CHANNEL_HAS_VIDEO]->(v)
+WITH v, row
+MATCH (co:Country {country_code: row.country_code})
+MERGE (v)-[:VIDEO_TRENDING_IN_COUNTRY]->(co)
+WITH v, row
+OPTIONAL MATCH (d:Day {day_name: row.trending_day})
+FOREACH (_ IN CASE WHEN d IS NULL THEN [] ELSE [1] END | MERGE (v)-[:VIDEO_TRENDING_ON]->(d))
+RETURN COUNT(v) AS created
+"""
+
+TAG_RELATIONSHIP_QUERY = """
+UNWIND $relationships AS rel
+MATCH (v:Video {video_unique_id: rel.video_unique_id})
+MATCH (t:Tag {tag_name: rel.tag_name})
+MERGE (v)-[:VIDEO_HAS_TAG]->(t)
+RETURN COUNT(*) as created
+"""
+
+def create_video_batch(batch_rows, batch_tags, graph):
+    """
+    Create a batch of video nodes with one UNWIND query, then their tag relationships.
+    Returns (videos created, tag relationships that failed to write).
+    """
+    rows = batch_rows.to_dict('records')
+    try:
+        success_count = graph.run(VIDEO_BATCH_QUERY, rows=rows).evaluate() or 0
+    except Exception as e:
+        # Fall back to one row at a time so a single bad row doesn't lose the batch
+        print(f"    ⚠️  Batch video creation failed: {e}")
+        print(f"    Falling back to individual video creation...")
+        success_count = 0
+        for row in rows:
+            try:
+                success_count += graph.run(VIDEO_BATCH_QUERY, rows=[row]).evaluate() or 0
+            except Exception:
+                continue
+
+    # Tag relationships for this batch in sub-batches (to avoid query size limits)
+    relationships = batch_tags[['video_unique_id', 'tag_name']].to_dict('records')
+    tag_rel_batch_size = 10000  # Process 10,000 relationships per query
+    tag_failures = 0
+    for i in range(0, len(relationships), tag_rel_batch_size):
+        sub_batch = relationships[i:i+tag_rel_batch_size]
         try:
-            # Process tag relationships in sub-batches to avoid query size limits
-            tag_rel_batch_size = 10000  # Process 10,000 relationships per query
-            total_tag_rels_created = 0
-            
-            for i in range(0, len(tag_relationships), tag_rel_batch_size):
-                tag_batch = tag_relationships[i:i+tag_rel_batch_size]
-                
-                # Use UNWIND to create all tag relationships in one query
-                tag_query = """
-                UNWIND $relationships AS rel
-                MATCH (v:Video {video_unique_id: rel.video_unique_id})
-                MATCH (t:Tag {tag_name: rel.tag_name})
-                MERGE (v)-[:VIDEO_HAS_TAG]->(t)
-                RETURN COUNT(*) as created
-                """
-                
-                graph.run(tag_query, relationships=tag_batch)
-                total_tag_rels_created += len(tag_batch)
-            
-            # Optional: Print progress for large batches
-            if len(tag_relationships) > 1000:
-                print(f"    Created {total_tag_rels_created:,} tag relationships for {success_count} videos")
+            graph.run(TAG_RELATIONSHIP_QUERY, relationships=sub_batch)
         except Exception as e:
-            # If batch creation fails, fall back to individual creation (slower but more reliable)
             print(f"    ⚠️  Batch tag relationship creation failed: {e}")
-            print(f"    Falling back to individual tag relationship creation...")
-            created_count = 0
-            for rel in tag_relationships:
-                try:
-                    graph.run("""
-                        MATCH (v:Video {video_unique_id: $video_unique_id})
-                        MATCH (t:Tag {tag_name: $tag_name})
-                        MERGE (v)-[:VIDEO_HAS_TAG]->(t)
-                    """, video_unique_id=rel['video_unique_id'], tag_name=rel['tag_name'])
-                    created_count += 1
-                except:
-                    continue
-            if created_count > 0:
-                print(f"    Created {created_count:,} tag relationships individually")
-    
-    return success_count
+            tag_failures += len(sub_batch)
+    if len(relationships) > 1000:
+        print(f"    Created {len(relationships):,} tag relationships for {success_count} videos")
+
+    return success_count, tag_failures
 
-# Process videos in batches
+video_params = video_rows(df)
 total_videos = len(df)
-num_batches = (total_videos + BATCH_SIZE - 1) // BATCH_SIZE
 videos_created = 0
+ingestion_start = datetime.now()
+
+if INGESTION_WORKERS > 1:
+    # Hash-partitioned writes over one connection per worker (see parallel_ingest.py)
+    pool = WriterPool(lambda: Graph(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)), INGESTION_WORKERS)
+    print(f"Processing {total_videos:,} videos with {len(pool)} workers in batches of {BATCH_SIZE}...")
+    parallel_stats = ingest_parallel(pool, VIDEO_NODE_QUERY, video_params, relationship_rows(df, video_params),
+                                     BATCH_SIZE, checkpoint)
+    videos_created = parallel_stats['Video']['rows']
+    ingestion_clean = all(stats['failed'] == 0 for stats in parallel_stats.values())
+    print(f"✓ Retried {sum(stats['retries'] for stats in parallel_stats.values())} times after transient errors (deadlocks)")
+else:
+    tag_relationships_all = tag_relationships(df, video_params['video_unique_id'], tag_nodes)
+    tag_positions = tag_relationships_all['position'].to_numpy()
+
+    # Process videos in batches
+    num_batches = (total_videos + BATCH_SIZE - 1) // BATCH_SIZE
+    print(f"Processing {total_videos:,} videos in {num_batches} batches of {BATCH_SIZE}...")
+
+    # The checkpoint only advances while every batch so far wrote all its rows;
+    # after a failed batch the rest of this run is not recorded and is redone next time
+    ingestion_clean = True
+    if 0 <= checkpoint.last_batch < num_batches - 1:
+        print(f"Skipping batches 1-{checkpoint.last_batch + 1} (committed before the last run stopped)")
+
+    for batch_num in range(num_batches):
+        start_idx = batch_num * BATCH_SIZE
+        end_idx = min((batch_num + 1) * BATCH_SIZE, total_videos)
+        if batch_num <= checkpoint.last_batch:
+            videos_created += end_idx - start_idx
+            continue
+        batch_tags = tag_relationships_all.iloc[np.searchsorted(tag_positions, start_idx):
+                                                np.searchsorted(tag_positions, end_idx)]
 
-print(f"Processing {total_videos:,} videos in {num_batches} batches of {BATCH_SIZE}...")
-
-for batch_num in range(num_batches):
-    start_idx = batch_num * BATCH_SIZE
-    end_idx = min((batch_num + 1) * BATCH_SIZE, total_videos)
-    batch_df = df.iloc[start_idx:end_idx]
-    
-    batch_created = create_video_batch(batch_df, graph, country_nodes, 
-                                       category_nodes, channel_nodes, 
-                                       tag_nodes, day_nodes)
-    videos_created += batch_created
+        batch_created, tag_failures = create_video_batch(video_params.iloc[start_idx:end_idx], batch_tags, graph)
+        videos_created += batch_created
     
-    progress = (batch_num + 1) / num_batches * 100
-    batch_errors = len(batch_df) - batch_created
-    print(f"  Batch {batch_num + 1}/{num_batches} ({progress:.1f}%): "
-          f"Created {batch_created}/{len(batch_df)} videos")
+        progress = (batch_num + 1) / num_batches * 100
+        batch_errors = (end_idx - start_idx) - batch_created
+        print(f"  Batch {batch_num + 1}/{num_batches} ({progress:.1f}%): "
+              f"Created {batch_created}/{end_idx - start_idx} videos")
     
-    if batch_errors > 0:
-        print(f"    ⚠️  {batch_errors} videos skipped due to errors")
+        if batch_errors > 0:
+            print(f"    ⚠️  {batch_errors} videos skipped due to errors")
+        if batch_errors > 0 or tag_failures > 0:
+            ingestion_clean = False
+        if ingestion_clean:
+            checkpoint.commit_batch(batch_num)
+
+if ingestion_clean:
+    checkpoint.finish()
+else:
+    print(f"⚠️  Some writes failed; checkpoint {CHECKPOINT_FILE} stops at the last fully written "
+          f"{'stage' if ingestion_mode == 'parallel' else 'batch'}, so rerun to retry the rest")
 
+ingestion_seconds = (datetime.now() - ingestion_start).total_seconds()
+print(f"\n✓ Ingested videos at {total_videos / max(ingestion_seconds, 1e-9):,.0f} videos/s "
+      f"({ingestion_seconds:.1f}s)")
 print(f"\n✓ Created {videos_created:,} Video nodes")
 errors = total_videos - videos_created
 if errors > 0:
@@ -689,7 +602,10 @@ ingestion_log = {
     'relationship_counts': relationship_counts,
     'validation': validation_results,
     'batch_size': BATCH_SIZE,
+    'ingestion_workers': INGESTION_WORKERS,
+    'checkpoint': checkpoint.status,
     'total_videos_processed': videos_created,
+    'video_ingestion_seconds': round(ingestion_seconds, 2),
     'total_videos_expected': total_videos,
     'errors': errors,
     'success_rate': f"{(videos_created / total_videos * 100):.2f}%" if total_videos > 0 else "0%"
@@ -870,14 +786,13 @@ report = f"""
 
 ---
 
-## 3. Indexes Created
+## 3. Constraints and Indexes
+
+### Uniqueness Constraints (MERGE/MATCH keys)
+{chr(10).join([f"- {label}: {prop}" for label, prop in CONSTRAINTS.values()])}
 
-- Video: video_id, trending_date, views, engagement_ratio
-- Channel: channel_title, total_views
-- Category: category_name
-- Country: country_code
-- Tag: tag_name
-- Day: day_name
+### Indexes
+{chr(10).join([f"- {label}: {prop}" for label, prop in INDEXES.values()])}
 
 ---
 
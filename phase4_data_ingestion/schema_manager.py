@@ -0,0 +1,128 @@
+"""
+Phase 4 Schema Manager
+Uniqueness constraints and indexes for every key used in MERGE and MATCH
+
+Ingestion MERGEs and MATCHes nodes by a key property. Without an index
+on that key, each lookup scans every node of the label, so loading time
+grows quadratically. This module declares the graph schema once. It
+applies the schema idempotently before loading and checks the result
+against SHOW INDEXES. The caller can then refuse to ingest when a
+required index is missing or not ONLINE.
+"""
+
+# (label, property) keys used by MERGE/MATCH during ingestion: uniqueness constraints
+# (each is backed by an index)
+CONSTRAINTS = {
+    'video_unique_id_unique': ('Video', 'video_unique_id'),
+    'channel_title_unique': ('Channel', 'channel_title'),
+    'category_id_unique': ('Category', 'category_id'),
+    'country_code_unique': ('Country', 'country_code'),
+    'tag_name_unique': ('Tag', 'tag_name'),
+    'day_name_unique': ('Day', 'day_name'),
+}
+
+# Non-unique lookup and range-filter properties used by queries in phases 4 and 5
+INDEXES = {
+    'video_id_index': ('Video', 'video_id'),
+    'video_trending_date_index': ('Video', 'trending_date'),
+    'video_views_index': ('Video', 'views'),
+    'video_engagement_index': ('Video', 'engagement_ratio'),
+    'channel_total_views_index': ('Channel', 'total_views'),
+    'category_name_index': ('Category', 'category_name'),
+}
+
+# Index types that serve equality lookups (RANGE in Neo4j 5, BTREE in 4.x)
+LOOKUP_INDEX_TYPES = ('RANGE', 'BTREE')
+
+
+class SchemaError(Exception):
+    """Raised when required constraints or indexes are missing after applying the schema"""
+
+
+def show_indexes(graph):
+    """Single-property lookup indexes as {(label, property): {name, state, constraint}}"""
+    indexes = {}
+    for row in graph.run("SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, state, "
+                         "owningConstraint").data():
+        if row['entityType'] != 'NODE' or row['type'] not in LOOKUP_INDEX_TYPES:
+            continue
+        if len(row['labelsOrTypes'] or []) != 1 or len(row['properties'] or []) != 1:
+            continue
+        indexes[(row['labelsOrTypes'][0], row['properties'][0])] = {
+            'name': row['name'], 'state': row['state'], 'constraint': row['owningConstraint']}
+    return indexes
+
+
+def apply_schema(graph):
+    """
+    Create missing constraints and indexes (safe to run repeatedly).
+
+    A plain index on a key that needs a uniqueness constraint is dropped
+    first, since Neo4j will not create a constraint over an existing index.
+    Returns the names of the schema objects created.
+    """
+    existing = show_indexes(graph)
+    created = []
+    for name, (label, prop) in CONSTRAINTS.items():
+        current = existing.get((label, prop))
+        if current and current['constraint']:
+            continue
+        if current:
+            graph.run(f"DROP INDEX {current['name']} IF EXISTS")
+        graph.run(f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE")
+        created.append(name)
+    for name, (label, prop) in INDEXES.items():
+        if (label, prop) in existing:
+            continue
+        graph.run(f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})")
+        created.append(name)
+    if created:
+        graph.run("CALL db.awaitIndexes(300)")
+    return created
+
+
+def verify_schema(graph):
+    """List of problems with the required schema; empty when every key is covered by an ONLINE index"""
+    existing = show_indexes(graph)
+    problems = []
+    for name, (label, prop) in CONSTRAINTS.items():
+        current = existing.get((label, prop))
+        if current is None:
+            problems.append(f"missing uniqueness constraint on :{label}({prop})")
+        elif not current['constraint']:
+            problems.append(f"index on :{label}({prop}) is not backed by a uniqueness constraint")
+        elif current['state'] != 'ONLINE':
+            problems.append(f"index on :{label}({prop}) is {current['state']}")
+    for name, (label, prop) in INDEXES.items():
+        current = existing.get((label, prop))
+        if current is None:
+            problems.append(f"missing index on :{label}({prop})")
+        elif current['state'] != 'ONLINE':
+            problems.append(f"index on :{label}({prop}) is {current['state']}")
+    return problems
+
+
+def ensure_schema(graph):
+    """Apply the schema and verify it; raises SchemaError listing any problems"""
+    created = apply_schema(graph)
+    problems = verify_schema(graph)
+    if problems:
+        raise SchemaError("; ".join(problems))
+    return created
+
+
+if __name__ == '__main__':
+    # Apply the schema to an existing database, e.g. after neo4j-admin database import
+    import os
+    from py2neo import Graph
+
+    graph = Graph(os.getenv('NEO4J_URI', 'bolt://localhost:7687'),
+                  auth=(os.getenv('NEO4J_USER', 'neo4j'), os.getenv('NEO4J_PASSWORD', 'your_password_here')),
+                  name=os.getenv('NEO4J_DATABASE', 'neo4j'))
+    try:
+        created = ensure_schema(graph)
+    except SchemaError as e:
+        print(f"✗ Schema verification failed: {e}")
+        exit(1)
+    print(f"✓ Schema ready: {len(CONSTRAINTS)} constraints, {len(INDEXES)} indexes "
+          f"({len(created)} created, all ONLINE)")
@@ -18,16 +18,28 @@ import zipfile
 import warnings
 warnings.filterwarnings('ignore')
 
+# Shared figure rendering pool lives alongside the Phase 3 EDA script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'phase3_EDA'))
+from render_pool import FigureQueue, to_list
+from binned_scatter import scatter_panel_data
+from distribution_engine import DistributionCache
+
 # Set style for visualizations
+plot_style = 'seaborn-v0_8-darkgrid'
 try:
-    plt.style.use('seaborn-v0_8-darkgrid')
+    plt.style.use(plot_style)
 except:
     try:
-        plt.style.use('seaborn-darkgrid')
+        plot_style = 'seaborn-darkgrid'
+        plt.style.use(plot_style)
     except:
-        plt.style.use('default')
+        plot_style = 'default'
+        plt.style.use(plot_style)
 sns.set_palette("husl")
 
+# Charts are queued while queries run and rendered in a process pool per group
+figures = FigureQueue(style=plot_style)
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -191,49 +203,41 @@ def save_results_to_csv(results, filepath, batch_size=BATCH_SIZE):
 # VISUALIZATION FUNCTIONS
 # ============================================================================
 
+def heatmap_data(pivot_df):
+    """Convert a pivoted DataFrame into heatmap spec data"""
+    return {'values': pivot_df.values.tolist(), 'row_labels': to_list(pivot_df.index),
+            'col_labels': to_list(pivot_df.columns)}
+
 def create_bar_chart(data, x_col, y_col, title, filepath, xlabel=None, ylabel=None, top_n=10):
-    """Create a bar chart visualization"""
+    """Queue a bar chart visualization"""
     try:
         df = pd.DataFrame(data)
         if len(df) > top_n:
             df = df.head(top_n)
         
-        plt.figure(figsize=(12, 6))
-        plt.barh(range(len(df)), df[y_col].values)
-        plt.yticks(range(len(df)), df[x_col].values)
-        plt.xlabel(ylabel or y_col)
-        plt.ylabel(xlabel or x_col)
-        plt.title(title)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {filepath}")
+        figures.add('barh', filepath, {'labels': to_list(df[x_col]), 'values': to_list(df[y_col])},
+                    figsize=(12, 6), xlabel=ylabel or y_col, ylabel=xlabel or x_col, title=title)
+        print(f"  ✓ Queued visualization: {filepath}")
         return True
     except Exception as e:
         print(f"  ✗ Failed to create visualization: {e}")
         return False
 
 def create_line_chart(data, x_col, y_col, title, filepath, xlabel=None, ylabel=None):
-    """Create a line chart visualization"""
+    """Queue a line chart visualization"""
     try:
         df = pd.DataFrame(data)
-        plt.figure(figsize=(12, 6))
-        plt.plot(df[x_col], df[y_col], marker='o')
-        plt.xlabel(xlabel or x_col)
-        plt.ylabel(ylabel or y_col)
-        plt.title(title)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {filepath}")
+        figures.add('lines', filepath, {'series': [{'x': to_list(df[x_col]), 'y': to_list(df[y_col])}]},
+                    figsize=(12, 6), linewidth=1.5, xlabel=xlabel or x_col, ylabel=ylabel or y_col,
+                    title=title, xtick_rotation=45)
+        print(f"  ✓ Queued visualization: {filepath}")
         return True
     except Exception as e:
         print(f"  ✗ Failed to create visualization: {e}")
         return False
 
 def create_heatmap(data, title, filepath, x_col=None, y_col=None, value_col=None):
-    """Create a heatmap visualization"""
+    """Queue a heatmap visualization"""
     try:
         df = pd.DataFrame(data)
         
@@ -243,36 +247,35 @@ def create_heatmap(data, title, filepath, x_col=None, y_col=None, value_col=None
             # Assume numeric columns
             pivot_df = df.select_dtypes(include=[np.number])
         
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(pivot_df, annot=True, fmt='.2f', cmap='YlOrRd', cbar_kws={'label': value_col or 'Value'})
-        plt.title(title)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {filepath}")
+        figures.add('heatmap', filepath, heatmap_data(pivot_df), figsize=(12, 8), annot=True,
+                    fmt='.2f', cmap='YlOrRd', cbar_kws={'label': value_col or 'Value'}, title=title)
+        print(f"  ✓ Queued visualization: {filepath}")
         return True
     except Exception as e:
         print(f"  ✗ Failed to create visualization: {e}")
         return False
 
-def create_scatter_plot(data, x_col, y_col, title, filepath, xlabel=None, ylabel=None):
-    """Create a scatter plot visualization"""
+def create_scatter_plot(data, x_col, y_col, title, filepath, xlabel=None, ylabel=None,
+                        binned=None, log_x=False, log_y=False):
+    """Queue a scatter plot visualization (density-binned for large result sets)"""
     try:
         df = pd.DataFrame(data)
-        plt.figure(figsize=(10, 6))
-        plt.scatter(df[x_col], df[y_col], alpha=0.5)
-        plt.xlabel(xlabel or x_col)
-        plt.ylabel(ylabel or y_col)
-        plt.title(title)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {filepath}")
+        kind, plot_data = scatter_panel_data(df[x_col], df[y_col], binned=binned,
+                                             log_x=log_x, log_y=log_y)
+        figures.add(kind, filepath, plot_data, figsize=(10, 6), alpha=0.5,
+                    xscale='log' if log_x else None, yscale='log' if log_y else None,
+                    xlabel=xlabel or x_col, ylabel=ylabel or y_col, title=title)
+        print(f"  ✓ Queued visualization: {filepath}")
         return True
     except Exception as e:
         print(f"  ✗ Failed to create visualization: {e}")
         return False
 
+def render_queued_figures(group_name):
+    """Render every chart queued while a query group was running"""
+    print(f"\n[{group_name}] Rendering {len(figures)} queued visualizations...")
+    return figures.render()
+
 # ============================================================================
 # GROUP A: SIMPLE QUERIES
 # ============================================================================
@@ -426,6 +429,8 @@ def run_group_a_queries(graph):
         summary_content += f"The busiest day has {max(r['video_count'] for r in results_a6)} trending videos. "
         summary_content += "This helps understand weekly content distribution patterns.\n\n"
     
+    render_queued_figures('A')
+    
     # Save Group A index
     index_path = RESULTS_DIR / 'groupA_index.json'
     with open(index_path, 'w') as f:
@@ -535,13 +540,10 @@ def run_group_b_queries(graph):
         # Take top tags by frequency
         top_tags = pivot_data.sum().nlargest(15).index
         pivot_subset = pivot_data[top_tags]
-        plt.figure(figsize=(14, 8))
-        sns.heatmap(pivot_subset, annot=True, fmt='.0f', cmap='YlOrRd', cbar_kws={'label': 'Co-occurrence Count'})
-        plt.title('Tag Co-occurrence with Categories (Top 15 Tags)')
-        plt.tight_layout()
-        plt.savefig(viz_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {viz_path}")
+        figures.add('heatmap', viz_path, heatmap_data(pivot_subset), figsize=(14, 8), annot=True,
+                    fmt='.0f', cmap='YlOrRd', cbar_kws={'label': 'Co-occurrence Count'},
+                    title='Tag Co-occurrence with Categories (Top 15 Tags)')
+        print(f"  ✓ Queued visualization: {viz_path}")
         group_b_files.append({'query': 'B.3', 'csv': str(csv_path), 'viz': str(viz_path)})
         summary_content += "## B.3: Tag Co-occurrence with Categories\n\n"
         summary_content += f"This query analyzes which tags frequently appear together with categories. "
@@ -614,6 +616,8 @@ def run_group_b_queries(graph):
             'interpretation': f"Correlation of {correlation:.4f} between average views and engagement ratio"
         })
     
+    render_queued_figures('B')
+    
     # Save statistical tests
     if statistical_tests:
         stats_path = REPORTS_DIR / 'statistical_tests.csv'
@@ -675,14 +679,11 @@ def run_group_c_analysis(graph):
         correlation_matrix.to_csv(csv_path)
         print(f"  ✓ Saved correlation matrix to {csv_path}")
         
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(correlation_matrix, annot=True, fmt='.3f', cmap='coolwarm', center=0,
-                   square=True, linewidths=1, cbar_kws={'label': 'Correlation Coefficient'})
-        plt.title('Video Metrics Correlation Matrix')
-        plt.tight_layout()
-        plt.savefig(viz_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {viz_path}")
+        figures.add('heatmap', viz_path, heatmap_data(correlation_matrix), figsize=(10, 8),
+                    annot=True, fmt='.3f', cmap='coolwarm', center=0, square=True, linewidths=1,
+                    cbar_kws={'label': 'Correlation Coefficient'},
+                    title='Video Metrics Correlation Matrix')
+        print(f"  ✓ Queued visualization: {viz_path}")
         
         group_c_files.append({'analysis': 'C.1', 'csv': str(csv_path), 'viz': str(viz_path)})
         summary_content += "## C.1: Correlation Analysis\n\n"
@@ -704,15 +705,12 @@ def run_group_c_analysis(graph):
         
         # Distribution plot
         viz_path = VISUALIZATIONS_DIR / 'groupC_C2_engagement_distribution.png'
-        plt.figure(figsize=(12, 6))
-        plt.hist(df_c2['engagement_ratio'], bins=50, edgecolor='black')
-        plt.xlabel('Engagement Ratio')
-        plt.ylabel('Frequency')
-        plt.title('Distribution of Engagement Ratios')
-        plt.tight_layout()
-        plt.savefig(viz_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Created visualization: {viz_path}")
+        # Same NumPy binning (and KDE) as the Phase 3 distribution charts
+        figures.add('hist_binned', viz_path,
+                    {'series': [DistributionCache(df_c2).hist_series('engagement_ratio', kde=True)]},
+                    figsize=(12, 6), alpha=1.0, xlabel='Engagement Ratio',
+                    ylabel='Frequency', title='Distribution of Engagement Ratios')
+        print(f"  ✓ Queued visualization: {viz_path}")
         
         group_c_files.append({'analysis': 'C.2', 'viz': str(viz_path)})
         summary_content += "## C.2: Engagement Distribution Analysis\n\n"
@@ -739,6 +737,8 @@ def run_group_c_analysis(graph):
         summary_content += f"The results show {len(results_c3)} category-country connections. "
         summary_content += "This reveals content preferences across different regions.\n\n"
     
+    render_queued_figures('C')
+    
     # Save Group C summary
     summary_path = REPORTS_DIR / 'phase5_groupC_summary.md'
     with open(summary_path, 'w', encoding='utf-8') as f: